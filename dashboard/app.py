@@ -2,12 +2,14 @@
 
 import streamlit as st
 import streamlit.components.v1 as components
-from datasets import load_dataset
-
 import sys
 sys.path.insert(0, "src")
-from interviewer.parser import parse_transcript
+from interviewer import timing
+from interviewer.corpus import current_version, open_store, refresh_corpus, version_dir
+from interviewer.data import load_raw_dataset
 from interviewer.github import load_comments, save_comment, get_github_token
+from interviewer.render import app_css, comment_html, escape_content, message_html
+from interviewer.similarity import SimilarityIndex
 
 
 st.set_page_config(
@@ -17,340 +19,69 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# Timing spans for this rerun: on with INTERVIEWER_TIMING=1 or ?debug=1
+timing.configure_from_env()
+show_debug_panel = st.query_params.get("debug") == "1"
+timing.clear_trace()
+
 # Mobile-friendly dark mode CSS
-st.markdown("""
-<style>
-    /* Dark mode base */
-    .stApp {
-        background-color: #1a1a1a;
-    }
-
-    /* Hide hamburger menu and footer for cleaner mobile view */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    /* Constrain width for desktop, center content */
-    .block-container {
-        padding-top: 1rem;
-        padding-bottom: 1rem;
-        padding-left: 1rem;
-        padding-right: 1rem;
-        max-width: 500px !important;
-        margin: 0 auto;
-    }
-
-    /* Chat bubble base styles */
-    .chat-bubble {
-        padding: 12px 16px;
-        border-radius: 18px;
-        margin: 8px 0;
-        max-width: 85%;
-        word-wrap: break-word;
-        line-height: 1.4;
-        font-size: 15px;
-    }
-
-    /* Assistant bubbles - left aligned, dark gray */
-    .assistant-bubble {
-        background-color: #2a2a2a;
-        color: #e0e0e0;
-        margin-right: auto;
-        margin-left: 0;
-        border-bottom-left-radius: 4px;
-    }
-
-    /* User bubbles - right aligned, blue */
-    .user-bubble {
-        background-color: #0084ff;
-        color: white;
-        margin-left: auto;
-        margin-right: 0;
-        border-bottom-right-radius: 4px;
-    }
-
-    /* Full-width variant for rows with inline action buttons */
-    .user-bubble-inline {
-        width: auto;
-        max-width: 93% !important;
-        margin-left: auto !important;
-        margin-right: 0 !important;
-        margin-top: 0 !important;
-        margin-bottom: 0 !important;
-    }
-
-    /* Container for proper alignment */
-    .bubble-container {
-        display: flex;
-        width: 100%;
-    }
-
-    .bubble-container.user {
-        justify-content: flex-end;
-    }
-
-    .bubble-container.assistant {
-        justify-content: flex-start;
-    }
-
-    /* User bubble with actions row */
-    .user-bubble-wrapper {
-        display: flex;
-        flex-direction: column;
-        align-items: flex-end;
-        max-width: 85%;
-        margin-left: auto;
-    }
-
-    .bubble-actions {
-        display: flex;
-        gap: 8px;
-        margin-top: 4px;
-        align-items: center;
-    }
-
-    .action-btn {
-        background: #333;
-        border: none;
-        color: #888;
-        width: 28px;
-        height: 28px;
-        border-radius: 50%;
-        cursor: pointer;
-        font-size: 16px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-    }
-
-    .action-btn:hover {
-        background: #444;
-        color: #fff;
-    }
-
-    .comment-count {
-        background: #ff6b35;
-        color: white;
-        min-width: 24px;
-        height: 24px;
-        border-radius: 12px;
-        font-size: 12px;
-        font-weight: bold;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        cursor: pointer;
-        padding: 0 6px;
-    }
-
-    .comment-count:hover {
-        background: #ff8555;
-    }
-
-    /* Comment bubbles - distinct style */
-    .comment-bubble {
-        background-color: #3d2a1a;
-        color: #f0d0a0;
-        padding: 10px 14px;
-        border-radius: 12px;
-        margin: 4px 0;
-        font-size: 14px;
-        border-left: 3px solid #ff6b35;
-    }
-
-    .comment-timestamp {
-        font-size: 11px;
-        color: #888;
-        margin-top: 4px;
-    }
-
-    .comments-section {
-        margin: 8px 0 16px 0;
-        padding-left: 20px;
-    }
-
-    /* Header styling */
-    .interview-header {
-        font-size: 14px;
-        color: #888;
-        text-align: center;
-        padding: 8px 0;
-        border-bottom: 1px solid #333;
-        margin-bottom: 16px;
-        position: sticky;
-        top: 0;
-        background: #1a1a1a;
-        z-index: 100;
-    }
-
-    /* Split selector - dark mode */
-    .stSelectbox {
-        max-width: 200px;
-        margin: 0 auto;
-    }
-
-    .stSelectbox > div > div {
-        background-color: #2a2a2a;
-        color: #e0e0e0;
-    }
-
-    /* Make buttons larger for touch */
-    .stButton > button {
-        min-height: 44px;
-        min-width: 44px;
-        font-size: 18px;
-        background-color: #2a2a2a;
-        color: #e0e0e0;
-        border: 1px solid #444;
-    }
-
-    .stButton > button:hover {
-        background-color: #3a3a3a;
-        border-color: #555;
-    }
-
-    /* Small inline buttons for comment actions */
-    .small-btn button {
-        min-height: 32px !important;
-        min-width: 32px !important;
-        font-size: 14px !important;
-        padding: 0 12px !important;
-    }
-
-    /* Inline action buttons (same row as bubble) */
-    [data-testid="stHorizontalBlock"] .stButton > button {
-        min-height: 36px !important;
-        min-width: 36px !important;
-        padding: 0 !important;
-        font-size: 16px !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        line-height: 1 !important;
-    }
-
-    [data-testid="stHorizontalBlock"] .stButton > button > div {
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        width: 100% !important;
-        height: 100% !important;
-    }
-
-    [data-testid="stHorizontalBlock"] .stButton > button > div > p {
-        margin: 0 !important;
-        padding: 0 !important;
-        line-height: 1 !important;
-        text-align: center !important;
-    }
-
-    /* Number input dark mode */
-    .stNumberInput > div > div > input {
-        background-color: #2a2a2a;
-        color: #e0e0e0;
-        border-color: #444;
-    }
-
-    /* Text area dark mode */
-    .stTextArea textarea {
-        background-color: #2a2a2a;
-        color: #e0e0e0;
-        border-color: #444;
-    }
-
-    .comment-form-top-gap {
-        height: 14px;
-    }
-
-    .comment-form-controls-gap {
-        height: 10px;
-    }
-
-    @keyframes comment-form-reveal {
-        from {
-            opacity: 0;
-            transform: translateY(-8px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-
-    /* Animate comment text box + action row on show */
-    div[data-testid="stTextArea"] {
-        animation: comment-form-reveal 180ms ease-out;
-    }
-
-    div[data-testid="stTextArea"] + div[data-testid="stHorizontalBlock"] {
-        animation: comment-form-reveal 220ms ease-out;
-    }
-
-    /* Divider */
-    hr {
-        border-color: #333;
-    }
-
-    /* Reduce default Streamlit element gaps */
-    .stButton {
-        margin-bottom: 0 !important;
-    }
-
-    .element-container {
-        margin-bottom: 0 !important;
-    }
-
-    /* Remove gap after columns (nav buttons) */
-    .stColumns {
-        margin-bottom: 0 !important;
-        gap: 0.5rem !important;
-    }
-
-    /* Target the horizontal block that wraps columns */
-    [data-testid="stHorizontalBlock"] {
-        margin-bottom: 0 !important;
-        gap: 0.5rem !important;
-    }
-
-    /* Add consistent vertical spacing to user message rows (columns with buttons) */
-    [data-testid="stHorizontalBlock"]:has(.user-bubble-inline) {
-        margin-top: 8px !important;
-        margin-bottom: 8px !important;
-    }
-
-    /* Reduce vertical spacing on all elements */
-    .stMarkdown {
-        margin-bottom: 0 !important;
-    }
-
-    div[data-testid="stVerticalBlock"] > div {
-        margin-bottom: 0 !important;
-        padding-bottom: 0 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-@st.cache_data
-def load_all_interviews():
-    """Load and parse all interviews from the dataset."""
-    ds = load_dataset("Anthropic/AnthropicInterviewer")
-
-    interviews = []
-    for split in ["workforce", "creatives", "scientists"]:
-        for row in ds[split]:
-            interviews.append({
-                "id": row["transcript_id"],
-                "split": split,
-                "text": row["text"],
-                "messages": parse_transcript(row["text"]),
-            })
-
-    return interviews
+st.markdown(f"<style>\n{app_css()}</style>", unsafe_allow_html=True)
+
+
+def get_corpus_version():
+    """Current corpus version, building the corpus cache on first start."""
+    version = current_version()
+    if version is None:
+        with timing.span("load_dataset"):
+            ds = load_raw_dataset()
+        with timing.span("refresh_corpus"):
+            version = refresh_corpus(ds).version
+    return version
+
+
+@st.cache_resource
+def load_all_interviews(version):
+    """Memory-map a corpus version's compressed store, shared by all sessions.
+
+    Every server process maps the same file, so the corpus is held once per host.
+    """
+    timing.incr("cache_misses.load_all_interviews")
+    with timing.span("open_store"):
+        return open_store(version)
+
+
+@st.cache_resource
+def load_similarity_index(version):
+    """Load the similar-interviews index of a corpus version."""
+    timing.incr("cache_misses.load_similarity_index")
+    return SimilarityIndex.load(version_dir(version) / "similarity.npz")
+
+
+@st.cache_resource
+def interview_positions(version, _interviews):
+    """Map transcript_id to (split, index within split, index overall)."""
+    timing.incr("cache_misses.interview_positions")
+    positions = {}
+    split_counts = {}
+    rows = zip(_interviews.ids, _interviews.splits)
+    for overall, (transcript_id, split) in enumerate(rows):
+        positions[transcript_id] = (split, split_counts.get(split, 0), overall)
+        split_counts[split] = split_counts.get(split, 0) + 1
+    return positions
+
+
+def go_to_interview(split, index):
+    """Button callback: switch the split filter and jump to an interview."""
+    st.session_state.selected_split = split
+    st.session_state.split_selector = split
+    st.session_state.current_index = index
+    st.session_state.scroll_to_top = True
 
 
 @st.cache_data(ttl=60)
 def load_comments_cached():
     """Load comments with short TTL for freshness."""
+    timing.incr("cache_misses.load_comments")
     return load_comments()
 
 
@@ -416,239 +147,323 @@ def trigger_scroll_to_top_if_needed():
         st.session_state.scroll_to_top = False
 
 
-# Load data
-interviews = load_all_interviews()
-all_comments = load_comments_cached()
-
-# Initialize session state
-if "current_index" not in st.session_state:
-    st.session_state.current_index = 0
-if "selected_split" not in st.session_state:
-    st.session_state.selected_split = "all"
-if "adding_comment_to" not in st.session_state:
-    st.session_state.adding_comment_to = None  # (transcript_id, message_index) or None
-if "expanded_comments" not in st.session_state:
-    st.session_state.expanded_comments = set()  # set of (transcript_id, message_index)
-if "scroll_to_top" not in st.session_state:
-    st.session_state.scroll_to_top = False
-
-
-# Filter by split
-split_options = ["all", "workforce", "creatives", "scientists"]
-selected_split = st.selectbox(
-    "Filter by group",
-    split_options,
-    index=split_options.index(st.session_state.selected_split),
-    key="split_selector",
-)
+def render():
+    """Render the viewer for the current session state."""
+    # Load data. Each session stays on the corpus version it started with, so a
+    # refresh only affects new sessions.
+    if "corpus_version" not in st.session_state:
+        st.session_state.corpus_version = get_corpus_version()
+    corpus_version = st.session_state.corpus_version
+
+    timing.incr("cache_calls.load_all_interviews")
+    with timing.span("load_all_interviews"):
+        interviews = load_all_interviews(corpus_version)
+    timing.incr("cache_calls.load_comments")
+    with timing.span("load_comments"):
+        all_comments = load_comments_cached()
+    timing.incr("cache_calls.load_similarity_index")
+    with timing.span("load_similarity_index"):
+        similarity_index = load_similarity_index(corpus_version)
+    timing.incr("cache_calls.interview_positions")
+    positions = interview_positions(corpus_version, interviews)
+
+    # Initialize session state
+    if "current_index" not in st.session_state:
+        st.session_state.current_index = 0
+    if "selected_split" not in st.session_state:
+        st.session_state.selected_split = "all"
+    if "adding_comment_to" not in st.session_state:
+        # (transcript_id, message_index) or None
+        st.session_state.adding_comment_to = None
+    if "expanded_comments" not in st.session_state:
+        # set of (transcript_id, message_index)
+        st.session_state.expanded_comments = set()
+    if "scroll_to_top" not in st.session_state:
+        st.session_state.scroll_to_top = False
 
-if selected_split != st.session_state.selected_split:
-    st.session_state.selected_split = selected_split
-    st.session_state.current_index = 0
-
-if selected_split == "all":
-    filtered_interviews = interviews
-else:
-    filtered_interviews = [i for i in interviews if i["split"] == selected_split]
-
-total_count = len(filtered_interviews)
-current_index = st.session_state.current_index
-
-# Ensure index is valid
-if current_index >= total_count:
-    current_index = 0
-    st.session_state.current_index = 0
-
-current_interview = filtered_interviews[current_index]
-transcript_id = current_interview["id"]
-
-# Header
-st.markdown(
-    f'<div class="interview-header">'
-    f'<strong>{transcript_id}</strong> · {current_interview["split"]} · '
-    f'{current_index + 1} of {total_count}'
-    f'</div>',
-    unsafe_allow_html=True
-)
+    # Filter by split
+    split_options = ["all", "workforce", "creatives", "scientists"]
+    selected_split = st.selectbox(
+        "Filter by group",
+        split_options,
+        key="split_selector",
+    )
 
-# Top navigation
-top_col1, top_col2, top_col3 = st.columns([1, 2, 1])
-with top_col1:
-    if st.button("← Prev", key="prev_top", use_container_width=True, disabled=(current_index == 0)):
-        st.session_state.current_index = current_index - 1
-        st.rerun()
-with top_col2:
-    # Jump to specific interview (top nav)
-    top_new_index = st.number_input(
-        "Go to top",
-        min_value=1,
-        max_value=total_count,
-        value=current_index + 1,
-        label_visibility="collapsed",
+    if selected_split != st.session_state.selected_split:
+        st.session_state.selected_split = selected_split
+        st.session_state.current_index = 0
+
+    # Filter on the store's split list so only the shown transcript is decompressed
+    if selected_split == "all":
+        filtered_rows = range(len(interviews))
+    else:
+        filtered_rows = [
+            i for i, split in enumerate(interviews.splits) if split == selected_split
+        ]
+
+    total_count = len(filtered_rows)
+    current_index = st.session_state.current_index
+
+    # Ensure index is valid
+    if current_index >= total_count:
+        current_index = 0
+        st.session_state.current_index = 0
+
+    current_interview = interviews[filtered_rows[current_index]]
+    transcript_id = current_interview["id"]
+
+    # Header
+    st.markdown(
+        f'<div class="interview-header">'
+        f'<strong>{transcript_id}</strong> · {current_interview["split"]} · '
+        f'{current_index + 1} of {total_count}'
+        f'</div>',
+        unsafe_allow_html=True
     )
-    if top_new_index - 1 != current_index:
-        st.session_state.current_index = top_new_index - 1
-        st.rerun()
-with top_col3:
-    if st.button("Next →", key="next_top", use_container_width=True, disabled=(current_index >= total_count - 1)):
-        st.session_state.current_index = current_index + 1
-        st.session_state.scroll_to_top = True
-        st.rerun()
-
-has_github_token = get_github_token() is not None
-
-for msg_idx, msg in enumerate(current_interview["messages"]):
-    # Escape HTML in content and convert newlines
-    content = msg.content.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    content = content.replace("\n", "<br>")
-
-    if msg.role == "assistant":
-        # Assistant message - simple bubble
-        st.markdown(
-            f'<div class="bubble-container assistant">'
-            f'<div class="chat-bubble assistant-bubble">{content}</div>'
-            f'</div>',
-            unsafe_allow_html=True
+
+    # Top navigation
+    top_col1, top_col2, top_col3 = st.columns([1, 2, 1])
+    with top_col1:
+        if st.button(
+            "← Prev",
+            key="prev_top",
+            use_container_width=True,
+            disabled=(current_index == 0),
+        ):
+            st.session_state.current_index = current_index - 1
+            st.rerun()
+    with top_col2:
+        # Jump to specific interview (top nav)
+        top_new_index = st.number_input(
+            "Go to top",
+            min_value=1,
+            max_value=total_count,
+            value=current_index + 1,
+            label_visibility="collapsed",
         )
-    else:
-        # User message - bubble with comment actions
-        comment_key = (transcript_id, msg_idx)
-        msg_comments = all_comments.get(comment_key, [])
-        comment_count = len(msg_comments)
-        is_expanded = comment_key in st.session_state.expanded_comments
-        is_adding = st.session_state.adding_comment_to == comment_key
-
-        # Render user bubble with action buttons on same line (buttons on left)
-        if has_github_token:
-            # Columns: [add, count?, bubble, spacer]
-            if comment_count > 0:
-                cols = st.columns([1, 1, 10])
-                add_col, count_col, bubble_col = cols[0], cols[1], cols[2]
+        if top_new_index - 1 != current_index:
+            st.session_state.current_index = top_new_index - 1
+            st.rerun()
+    with top_col3:
+        if st.button(
+            "Next →",
+            key="next_top",
+            use_container_width=True,
+            disabled=(current_index >= total_count - 1),
+        ):
+            st.session_state.current_index = current_index + 1
+            st.session_state.scroll_to_top = True
+            st.rerun()
+
+    has_github_token = get_github_token() is not None
+
+    with timing.span("render_messages", count=len(current_interview["messages"])):
+        for msg_idx, msg in enumerate(current_interview["messages"]):
+            if msg.role == "assistant":
+                # Assistant message - simple bubble
+                st.markdown(message_html(msg), unsafe_allow_html=True)
             else:
-                cols = st.columns([1, 11])
-                add_col, bubble_col = cols[0], cols[1]
-                count_col = None
-
-            with add_col:
-                if st.button(
-                    "",
-                    key=f"add_{msg_idx}",
-                    help="Add comment",
-                    icon=":material/add:",
-                ):
-                    if is_adding:
-                        st.session_state.adding_comment_to = None
+                # User message - bubble with comment actions
+                comment_key = (transcript_id, msg_idx)
+                msg_comments = all_comments.get(comment_key, [])
+                comment_count = len(msg_comments)
+                is_expanded = comment_key in st.session_state.expanded_comments
+                is_adding = st.session_state.adding_comment_to == comment_key
+
+                # Render user bubble with action buttons on same line (buttons on left)
+                if has_github_token:
+                    # Columns: [add, count?, bubble, spacer]
+                    if comment_count > 0:
+                        cols = st.columns([1, 1, 10])
+                        add_col, count_col, bubble_col = cols[0], cols[1], cols[2]
                     else:
-                        st.session_state.adding_comment_to = comment_key
-                    st.rerun()
-
-            if count_col is not None:
-                with count_col:
-                    if st.button(f"{comment_count}", key=f"count_{msg_idx}", help="Show/hide comments"):
-                        if is_expanded:
-                            st.session_state.expanded_comments.discard(comment_key)
-                        else:
-                            st.session_state.expanded_comments.add(comment_key)
-                        st.rerun()
+                        cols = st.columns([1, 11])
+                        add_col, bubble_col = cols[0], cols[1]
+                        count_col = None
+
+                    with add_col:
+                        if st.button(
+                            "",
+                            key=f"add_{msg_idx}",
+                            help="Add comment",
+                            icon=":material/add:",
+                        ):
+                            if is_adding:
+                                st.session_state.adding_comment_to = None
+                            else:
+                                st.session_state.adding_comment_to = comment_key
+                            st.rerun()
+
+                    if count_col is not None:
+                        with count_col:
+                            if st.button(
+                                f"{comment_count}",
+                                key=f"count_{msg_idx}",
+                                help="Show/hide comments",
+                            ):
+                                if is_expanded:
+                                    st.session_state.expanded_comments.discard(comment_key)
+                                else:
+                                    st.session_state.expanded_comments.add(comment_key)
+                                st.rerun()
 
-            with bubble_col:
-                st.markdown(
-                    f'<div class="chat-bubble user-bubble user-bubble-inline">{content}</div>',
-                    unsafe_allow_html=True
-                )
-        else:
-            # No token - just render the bubble
-            st.markdown(
-                f'<div class="bubble-container user">'
-                f'<div class="chat-bubble user-bubble">{content}</div>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
-
-        # Show existing comments if expanded
-        if is_expanded and msg_comments:
-            st.markdown('<div class="comments-section">', unsafe_allow_html=True)
-            for comment in msg_comments:
-                comment_text = comment["text"].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                comment_text = comment_text.replace("\n", "<br>")
-                timestamp = comment.get("timestamp", "")[:10]  # Just the date
-                st.markdown(
-                    f'<div class="comment-bubble">{comment_text}'
-                    f'<div class="comment-timestamp">{timestamp}</div>'
-                    f'</div>',
-                    unsafe_allow_html=True
-                )
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        # Show add comment form if active
-        if is_adding:
-            if has_github_token:
-                # Keep the form aligned under the user bubble column.
-                if comment_count > 0:
-                    form_cols = st.columns([1, 1, 10])
-                    form_col = form_cols[2]
+                    with bubble_col:
+                        content = escape_content(msg.content)
+                        st.markdown(
+                            '<div class="chat-bubble user-bubble user-bubble-inline">'
+                            f'{content}</div>',
+                            unsafe_allow_html=True
+                        )
                 else:
-                    form_cols = st.columns([1, 11])
-                    form_col = form_cols[1]
-            else:
-                form_col = st.container()
-
-            with form_col:
-                st.markdown('<div class="comment-form-top-gap"></div>', unsafe_allow_html=True)
-                new_comment = st.text_area(
-                    "Add comment",
-                    key=f"comment_text_{msg_idx}",
-                    height=100,
-                    label_visibility="collapsed",
-                    placeholder="Write your comment...",
-                )
-                st.markdown('<div class="comment-form-controls-gap"></div>', unsafe_allow_html=True)
-                submit_col, _, cancel_col = st.columns([1, 0.18, 1])
-                with submit_col:
-                    if st.button("Submit", key=f"submit_{msg_idx}", use_container_width=True):
-                        if new_comment.strip():
-                            if save_comment(transcript_id, msg_idx, new_comment.strip()):
+                    # No token - just render the bubble
+                    st.markdown(message_html(msg), unsafe_allow_html=True)
+
+                # Show existing comments if expanded
+                if is_expanded and msg_comments:
+                    st.markdown(
+                        '<div class="comments-section">', unsafe_allow_html=True
+                    )
+                    for comment in msg_comments:
+                        st.markdown(comment_html(comment), unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+                # Show add comment form if active
+                if is_adding:
+                    if has_github_token:
+                        # Keep the form aligned under the user bubble column.
+                        if comment_count > 0:
+                            form_cols = st.columns([1, 1, 10])
+                            form_col = form_cols[2]
+                        else:
+                            form_cols = st.columns([1, 11])
+                            form_col = form_cols[1]
+                    else:
+                        form_col = st.container()
+
+                    with form_col:
+                        st.markdown(
+                            '<div class="comment-form-top-gap"></div>',
+                            unsafe_allow_html=True,
+                        )
+                        new_comment = st.text_area(
+                            "Add comment",
+                            key=f"comment_text_{msg_idx}",
+                            height=100,
+                            label_visibility="collapsed",
+                            placeholder="Write your comment...",
+                        )
+                        st.markdown(
+                            '<div class="comment-form-controls-gap"></div>',
+                            unsafe_allow_html=True,
+                        )
+                        submit_col, _, cancel_col = st.columns([1, 0.18, 1])
+                        with submit_col:
+                            if st.button(
+                                "Submit",
+                                key=f"submit_{msg_idx}",
+                                use_container_width=True,
+                            ):
+                                text = new_comment.strip()
+                                if text:
+                                    if save_comment(transcript_id, msg_idx, text):
+                                        st.session_state.adding_comment_to = None
+                                        # Clear the cache to reload comments
+                                        load_comments_cached.clear()
+                                        st.success("Comment saved!")
+                                        st.rerun()
+                        with cancel_col:
+                            if st.button(
+                                "Cancel",
+                                key=f"cancel_{msg_idx}",
+                                use_container_width=True,
+                            ):
                                 st.session_state.adding_comment_to = None
-                                # Clear the cache to reload comments
-                                load_comments_cached.clear()
-                                st.success("Comment saved!")
                                 st.rerun()
-                with cancel_col:
-                    if st.button("Cancel", key=f"cancel_{msg_idx}", use_container_width=True):
-                        st.session_state.adding_comment_to = None
-                        st.rerun()
-
-# Show warning if no GitHub token
-if not has_github_token:
-    st.caption("💡 Add GITHUB_TOKEN to secrets to enable comments")
-
-# Navigation buttons at bottom
-st.markdown("---")
-col1, col2, col3 = st.columns([1, 2, 1])
-
-with col1:
-    if st.button("← Prev", key="prev_bottom", use_container_width=True, disabled=(current_index == 0)):
-        st.session_state.current_index = current_index - 1
-        st.rerun()
-
-with col2:
-    # Jump to specific interview
-    new_index = st.number_input(
-        "Go to",
-        min_value=1,
-        max_value=total_count,
-        value=current_index + 1,
-        label_visibility="collapsed",
-    )
-    if new_index - 1 != current_index:
-        st.session_state.current_index = new_index - 1
-        st.session_state.scroll_to_top = True
-        st.rerun()
-
-with col3:
-    if st.button("Next →", key="next_bottom", use_container_width=True, disabled=(current_index >= total_count - 1)):
-        st.session_state.current_index = current_index + 1
-        st.session_state.scroll_to_top = True
-        st.rerun()
+
+    # Show warning if no GitHub token
+    if not has_github_token:
+        st.caption("💡 Add GITHUB_TOKEN to secrets to enable comments")
+
+    # Similar interviews (precomputed neighbours of the user turns)
+    similar = []
+    if similarity_index is not None:
+        similar = similarity_index.similar(transcript_id)
+    if similar:
+        with st.expander("Similar interviews"):
+            for other_id, score in similar:
+                other_split, split_index, overall_index = positions[other_id]
+                if selected_split == "all":
+                    target = ("all", overall_index)
+                else:
+                    target = (other_split, split_index)
+                st.button(
+                    f"{other_id} · {other_split} · {score:.0%}",
+                    key=f"similar_{other_id}",
+                    use_container_width=True,
+                    on_click=go_to_interview,
+                    args=target,
+                )
+
+    # Navigation buttons at bottom
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col1:
+        if st.button(
+            "← Prev",
+            key="prev_bottom",
+            use_container_width=True,
+            disabled=(current_index == 0),
+        ):
+            st.session_state.current_index = current_index - 1
+            st.rerun()
+
+    with col2:
+        # Jump to specific interview
+        new_index = st.number_input(
+            "Go to",
+            min_value=1,
+            max_value=total_count,
+            value=current_index + 1,
+            label_visibility="collapsed",
+        )
+        if new_index - 1 != current_index:
+            st.session_state.current_index = new_index - 1
+            st.session_state.scroll_to_top = True
+            st.rerun()
+
+    with col3:
+        if st.button(
+            "Next →",
+            key="next_bottom",
+            use_container_width=True,
+            disabled=(current_index >= total_count - 1),
+        ):
+            st.session_state.current_index = current_index + 1
+            st.session_state.scroll_to_top = True
+            st.rerun()
+
+
+# Reruns cut short by st.rerun() or an error still finish the trace, as aborted.
+trace_enabled = show_debug_panel or timing.enabled_by_env()
+with timing.trace("rerun", enabled=trace_enabled) as rerun_trace:
+    render()
+
+if rerun_trace is not None and show_debug_panel:
+    trace_record = rerun_trace.record
+    with st.expander("Debug timing"):
+        st.caption(f"Rerun: {trace_record['duration_ms']:.1f} ms")
+        st.dataframe(
+            [
+                {
+                    "span": "  " * span["depth"] + span["name"],
+                    "start_ms": round(span["start_ms"], 1),
+                    "duration_ms": round(span["duration_ms"], 1),
+                }
+                for span in trace_record["spans"]
+            ],
+            use_container_width=True,
+        )
+        st.json(trace_record["counters"])
 
 trigger_scroll_to_top_if_needed()
@@ -0,0 +1,356 @@
+"""Benchmark suite for the hot paths, run over synthetic corpora of growing size."""
+
+import gc
+import itertools
+import json
+import multiprocessing
+import platform
+import queue
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+
+import pyarrow.parquet as pq
+
+from interviewer.corpus import current_version, open_store, refresh_corpus
+from interviewer.data import (
+    SPLITS,
+    compress_corpus,
+    get_split_counts,
+    iter_corpus,
+    parse_corpus,
+)
+from interviewer.github import parse_comments
+from interviewer.parser import parse_transcript
+from interviewer.render import transcript_html
+from interviewer.store import TranscriptStore
+from interviewer.synthetic import (
+    split_sizes,
+    synthetic_comments,
+    synthetic_dataset,
+    write_synthetic_dataset,
+)
+
+
+BASELINE_PATH = Path("benchmarks") / "baseline.json"
+DEFAULT_SCALES = (1, 10)
+REGRESSION_TOLERANCE = 0.2
+SAMPLE_SIZE = sum(get_split_counts().values())
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    """Best wall-clock time of ``func`` over ``repeat`` runs, GC off (as timeit)."""
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def corpus_nbytes(interviews: Iterable[dict]) -> int:
+    """Approximate memory of parsed interview records held in a list.
+
+    The records are streamed, so they need not all be in memory at once.
+    """
+    total = sys.getsizeof([])
+    for interview in interviews:
+        total += 8 + sys.getsizeof(interview) + sys.getsizeof(interview["id"])
+        total += sys.getsizeof(interview["text"]) + sys.getsizeof(interview["messages"])
+        for msg in interview["messages"]:
+            total += sys.getsizeof(msg) + sys.getsizeof(msg.__dict__)
+            total += sys.getsizeof(msg.content)
+    return total
+
+
+class _ParquetRows:
+    """Rows of a '<split>.parquet' file, read again in batches on every pass."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self):
+        for batch in pq.ParquetFile(self.path).iter_batches(batch_size=1000):
+            yield from batch.to_pylist()
+
+
+def run_benchmarks(
+    scales: tuple[float, ...] = DEFAULT_SCALES,
+    repeat: int = 3,
+    sample_size: int = SAMPLE_SIZE,
+) -> dict:
+    """Time the per-transcript paths on a sample and the load path at each scale.
+
+    Per-transcript paths (parsing, rendering, store access) cost the same
+    whatever the corpus size, so they run once on ``sample_size``
+    transcripts. The comment log and the corpus load path (``refresh_corpus``,
+    ``open_store`` and ``compress_corpus``) run on the full corpus at each
+    scale, streamed from Parquet files written once per scale, so generating
+    transcripts is not timed. The load path holds the corpus in memory the way
+    a refresh does, so large scales need a matching amount of RAM.
+
+    Returns:
+        Dict with 'meta', 'results' and 'memory'. Results are keyed by
+        benchmark name for the sample and '<benchmark>@<scale>x' for scaled
+        runs, and hold the scale (None for the sample), item count, best time
+        in seconds and microseconds per item; memory compares parsed Python
+        objects with the compressed store for each scale's full corpus.
+    """
+    results = {}
+    memory = {}
+
+    def record(name: str, scale: float | None, items: int, func: Callable[[], object]):
+        seconds = _time(func, repeat)
+        key = name if scale is None else f"{name}@{scale:g}x"
+        results[key] = {
+            "benchmark": name,
+            "scale": scale,
+            "items": items,
+            "seconds": seconds,
+            "us_per_item": seconds / max(items, 1) * 1e6,
+        }
+
+    # Per-transcript paths on a sample of the 1x corpus. With a one-entry LRU
+    # a sequential scan always misses; re-reading one record always hits.
+    sample = synthetic_dataset(sample=sample_size)
+    texts = [row["text"] for split in SPLITS for row in sample[split]]
+    corpus = parse_corpus(sample)
+    store = TranscriptStore.build(corpus, cache_size=1)
+    record("parse_transcript", None, len(texts),
+           lambda: [parse_transcript(t) for t in texts])
+    record("transcript_html", None, len(corpus),
+           lambda: [transcript_html(i["messages"]) for i in corpus])
+    record("store_build", None, len(corpus), lambda: TranscriptStore.build(corpus))
+    record("store_get_cold", None, len(store),
+           lambda: [store[i] for i in range(len(store))])
+    record("store_get_hot", None, len(store),
+           lambda: [store[0] for _ in range(len(store))])
+    record("list_get", None, len(corpus),
+           lambda: [corpus[0] for _ in range(len(corpus))])
+
+    for scale in scales:
+        comments_log = synthetic_comments(scale)
+        record("parse_comments", scale, comments_log.count("\n"),
+               lambda: parse_comments(comments_log))
+
+        # The dashboard's load path: build a corpus version once, then every
+        # server process memory-maps its published store.
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = write_synthetic_dataset(Path(tmp) / "dataset", scale)
+            dataset = {s: _ParquetRows(data_dir / f"{s}.parquet") for s in SPLITS}
+            count = sum(split_sizes(scale).values())
+
+            runs = itertools.count()
+            record("refresh_corpus", scale, count,
+                   lambda: refresh_corpus(dataset, root=Path(tmp) / str(next(runs))))
+            root = Path(tmp) / "0"
+            version = current_version(root)
+            record("open_store", scale, count, lambda: open_store(version, root))
+            record("compress_corpus", scale, count, lambda: compress_corpus(dataset))
+
+            published = open_store(version, root)
+            memory[f"{scale:g}x"] = {
+                "transcripts": count,
+                "objects_bytes": corpus_nbytes(iter_corpus(dataset)),
+                "store_bytes": published.nbytes,
+                "codec": published.codec,
+            }
+            del published
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "sample_size": sample_size,
+        },
+        "results": results,
+        "memory": memory,
+    }
+
+
+def _memory_status() -> dict[str, int]:
+    """Rss, Pss and private bytes of this process (Linux smaps_rollup)."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def _memory_worker(mode, version, root, ready, done, results, timeout):
+    from interviewer.corpus import load_version, open_store
+
+    before = _memory_status()
+    if mode == "mmap":
+        corpus = open_store(version, root)
+        for index in range(len(corpus)):
+            corpus.text(index)  # fault in every page of the mapping
+    else:
+        corpus = load_version(version, root)
+    ready.wait(timeout)
+    after = _memory_status()
+    results.put({key: after[key] - before[key] for key in after})
+    done.wait(timeout)
+    del corpus
+
+
+def _attach_workers(
+    ctx, mode: str, version: str, root: Path, workers: int, timeout: float
+) -> list[dict]:
+    """Start ``workers`` processes that hold the corpus at once; return their growth."""
+    ready, done = ctx.Barrier(workers), ctx.Event()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_memory_worker,
+            args=(mode, version, str(root), ready, done, results, timeout),
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    deadline = time.monotonic() + timeout
+    deltas = []
+    try:
+        while len(deltas) < workers:
+            try:
+                deltas.append(results.get(timeout=0.5))
+            except queue.Empty:
+                # Workers only exit after ``done``, so any exit here is a failure.
+                exited = [p.exitcode for p in processes if p.exitcode is not None]
+                if exited:
+                    raise RuntimeError(f"memory worker exited with code {exited[0]}")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"memory workers did not report within {timeout} s"
+                    )
+    finally:
+        done.set()
+        ready.abort()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+    return deltas
+
+
+def shared_memory_check(
+    version: str,
+    root: Path,
+    workers: tuple[int, ...] = (1, 4),
+    modes: tuple[str, ...] = ("mmap", "objects"),
+    timeout: float = 300,
+) -> dict:
+    """Memory each worker process adds for the corpus, mmap store vs. objects.
+
+    For each worker count, starts that many processes that attach to the
+    corpus at the same time and measures the growth of their Rss, Pss
+    (shared pages split between processes) and private memory. With the
+    memory-mapped store the corpus pages are shared, so the total Pss stays
+    about flat as workers are added; with objects it grows by a corpus per
+    worker.
+
+    Returns:
+        Mapping of mode to {'workers': {count: mean growth per worker in
+        bytes, plus 'pss_total'}, 'pss_per_added_worker': bytes}.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    report = {}
+    for mode in modes:
+        by_count = {}
+        for count in workers:
+            deltas = _attach_workers(ctx, mode, version, root, count, timeout)
+            by_count[count] = {
+                key: sum(d[key] for d in deltas) / count
+                for key in ("rss", "pss", "private")
+            }
+            by_count[count]["pss_total"] = sum(d["pss"] for d in deltas)
+        fewest, most = min(workers), max(workers)
+        growth = by_count[most]["pss_total"] - by_count[fewest]["pss_total"]
+        added = growth / max(most - fewest, 1)
+        report[mode] = {"workers": by_count, "pss_per_added_worker": added}
+    return report
+
+
+def compare(
+    current: dict, baseline: dict, tolerance: float = REGRESSION_TOLERANCE
+) -> list[dict]:
+    """Compare per-item timings against a baseline run.
+
+    Returns:
+        One row per benchmark present in both runs, with the time ratio
+        (current / baseline) and whether it exceeds ``1 + tolerance``.
+    """
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = result["us_per_item"] / base["us_per_item"]
+        rows.append({
+            "benchmark": key,
+            "baseline_us": base["us_per_item"],
+            "current_us": result["us_per_item"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def save_results(results: dict, path: str | Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def load_results(path: str | Path) -> dict | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def format_report(results: dict, comparison: list[dict] | None = None) -> str:
+    """Human-readable table of a run, with baseline ratios when available."""
+    ratios = {row["benchmark"]: row for row in comparison or []}
+    lines = [
+        f"{'benchmark':<28} {'items':>9} {'seconds':>10} {'us/item':>10} {'vs base':>9}"
+    ]
+    for key, r in results["results"].items():
+        line = (
+            f"{key:<28} {r['items']:>9} {r['seconds']:>10.4f} "
+            f"{r['us_per_item']:>10.2f}"
+        )
+        if key in ratios:
+            row = ratios[key]
+            line += f" {row['ratio']:>8.2f}x"
+            if row["regression"]:
+                line += "  REGRESSION"
+        lines.append(line)
+    for scale, m in results.get("memory", {}).items():
+        ratio = m["objects_bytes"] / m["store_bytes"]
+        lines.append(
+            f"memory@{scale} ({m['transcripts']} transcripts): "
+            f"objects {m['objects_bytes'] / 2**20:.1f} MB, "
+            f"{m['codec']} store {m['store_bytes'] / 2**20:.1f} MB "
+            f"({ratio:.1f}x smaller)"
+        )
+    return "\n".join(lines)
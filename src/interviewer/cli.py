@@ -0,0 +1,407 @@
+"""Command-line entry point: ``interviewer <command>``."""
+
+import argparse
+import os
+import sys
+
+from interviewer.github import (
+    COMMENTS_PATH, fetch_comments, get_github_token, load_local_comments,
+)
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    import requests
+
+    from interviewer.export import SPLITS, export_messages, infer_format
+
+    try:
+        fmt = args.format or infer_format(args.output)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.comments == "github":
+        token = get_github_token()
+        if token is None:
+            print(
+                "--comments github needs a GITHUB_TOKEN (env var or Streamlit secrets)",
+                file=sys.stderr,
+            )
+            return 1
+        try:
+            comments = fetch_comments(token)
+        except requests.RequestException as e:
+            print(f"Failed to load comments from GitHub: {e}", file=sys.stderr)
+            return 1
+    elif args.comments == "local":
+        comments = load_local_comments(args.comments_path)
+    else:
+        comments = None
+
+    rows = export_messages(
+        args.output,
+        fmt=fmt,
+        splits=[args.split] if args.split else SPLITS,
+        comments=comments,
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    print(f"Wrote {rows} messages to {args.output}")
+    return 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    from interviewer.benchmark import (
+        SAMPLE_SIZE,
+        compare,
+        format_report,
+        load_results,
+        run_benchmarks,
+        save_results,
+    )
+
+    results = run_benchmarks(
+        tuple(args.scales),
+        repeat=args.repeat,
+        sample_size=args.sample_size or SAMPLE_SIZE,
+    )
+    if args.output:
+        save_results(results, args.output)
+
+    baseline = load_results(args.baseline)
+    comparison = compare(results, baseline, args.tolerance) if baseline else None
+    print(format_report(results, comparison))
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+    if comparison and any(row["regression"] for row in comparison):
+        return 1
+    return 0
+
+
+def _cmd_timing_report(args: argparse.Namespace) -> int:
+    from interviewer.timing import read_traces, summarize
+
+    summary = summarize(read_traces(args.path))
+    counters = summary.pop("counters")
+    print(f"{'span':<28} {'count':>7} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]["p95"]):
+        print(
+            f"{name:<28} {stats['count']:>7} "
+            f"{stats['p50']:>10.1f} {stats['p95']:>10.1f}"
+        )
+    for name, value in sorted(counters.items()):
+        print(f"{name}: {value}")
+    return 0
+
+
+def _cmd_loadtest(args: argparse.Namespace) -> int:
+    import json
+
+    from interviewer.loadtest import run_load_test
+
+    report = run_load_test(
+        sessions=args.sessions,
+        actions=args.actions,
+        comment_rate=args.comment_rate,
+        check_sha=not args.no_sha_check,
+        api_latency=args.api_latency,
+        scale=args.scale,
+        real_dataset=args.real_dataset,
+    )
+    print(json.dumps(report, indent=2))
+    return 1 if report["comments_lost"] or report["failed_sessions"] else 0
+
+
+def _cmd_refresh(args: argparse.Namespace) -> int:
+    from interviewer.corpus import CORPUS_DIR, refresh_corpus
+    from interviewer.data import load_raw_dataset
+
+    dataset = load_raw_dataset(revision=args.revision, data_dir=args.data_dir)
+    result = refresh_corpus(
+        dataset,
+        root=args.corpus_dir or CORPUS_DIR,
+        revision=args.revision or args.data_dir,
+    )
+    if result.is_noop:
+        print(f"Corpus unchanged at version {result.version}")
+    else:
+        print(
+            f"Published version {result.version} (was {result.previous}): "
+            f"{len(result.added)} added, {len(result.changed)} changed, "
+            f"{len(result.removed)} removed, {result.unchanged} unchanged"
+        )
+    return 0
+
+
+def _cmd_duplicates(args: argparse.Namespace) -> int:
+    from interviewer.corpus import CORPUS_DIR, current_version, version_dir
+    from interviewer.similarity import SimilarityIndex
+
+    root = args.corpus_dir or CORPUS_DIR
+    version = args.version or current_version(root)
+    if version is None:
+        print(f"No corpus version in {root}; run 'interviewer refresh' first")
+        return 1
+
+    path = version_dir(version, root) / "similarity.npz"
+    index = SimilarityIndex.load(path)
+    if index is None:
+        print(f"No similarity index at {path}", file=sys.stderr)
+        return 1
+    report = index.near_duplicate_report(args.threshold)
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Wrote {len(report)} near-duplicate pairs to {args.output}")
+    elif report.empty:
+        print(f"No near-duplicate pairs at threshold {args.threshold}")
+    else:
+        print(report.to_string(index=False))
+    return 0
+
+
+def _cmd_build_static(args: argparse.Namespace) -> int:
+    from interviewer.corpus import CORPUS_DIR
+    from interviewer.static_site import DEFAULT_COMMENTS_URL, build_static_site
+
+    comments_url = args.comments_url
+    if comments_url is None:
+        comments_url = DEFAULT_COMMENTS_URL
+    result = build_static_site(
+        args.output_dir,
+        version=args.version,
+        root=args.corpus_dir or CORPUS_DIR,
+        comments_url=comments_url or None,
+    )
+    print(
+        f"Built version {result.version} into {args.output_dir}: "
+        f"{result.written} written, {result.skipped} unchanged, "
+        f"{result.removed} removed"
+    )
+    return 0
+
+
+def _cmd_memcheck(args: argparse.Namespace) -> int:
+    from interviewer.benchmark import shared_memory_check
+    from interviewer.corpus import CORPUS_DIR, current_version
+
+    root = args.corpus_dir or CORPUS_DIR
+    version = args.version or current_version(root)
+    if version is None:
+        print(f"No corpus version in {root}; run 'interviewer refresh' first")
+        return 1
+
+    workers = tuple(sorted(set(args.workers)))
+    report = shared_memory_check(version, root, workers=workers)
+    print("Memory growth per worker (MB)")
+    print(
+        f"{'mode':<10} {'workers':>7} {'rss':>8} {'pss':>8} {'private':>8} "
+        f"{'pss total':>10}"
+    )
+    for mode, result in report.items():
+        for count, stats in result["workers"].items():
+            sizes = (stats[k] / 2**20 for k in ("rss", "pss", "private"))
+            print(
+                f"{mode:<10} {count:>7} "
+                + " ".join(f"{size:>8.1f}" for size in sizes)
+                + f" {stats['pss_total'] / 2**20:>10.1f}"
+            )
+    added_mb = {
+        mode: result["pss_per_added_worker"] / 2**20 for mode, result in report.items()
+    }
+    for mode, mb in added_mb.items():
+        print(f"{mode}: each added worker costs {mb:.1f} MB Pss")
+    return 1 if added_mb["mmap"] > args.max_added_mb else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="interviewer",
+        description="Tools for the Anthropic Interviewer dataset.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export", help="Export parsed messages to Parquet, JSONL or CSV."
+    )
+    export.add_argument("output", help="Output file (.parquet, .jsonl or .csv).")
+    export.add_argument(
+        "--format", choices=["parquet", "jsonl", "csv"], default=None,
+        help="Output format. Inferred from the file suffix by default.",
+    )
+    export.add_argument(
+        "--split", choices=["workforce", "creatives", "scientists"], default=None,
+        help="Export a single split. Defaults to all splits.",
+    )
+    export.add_argument(
+        "--comments", choices=["none", "local", "github"], default="none",
+        help="Join comments from a local JSONL file or from GitHub.",
+    )
+    export.add_argument(
+        "--comments-path", default=COMMENTS_PATH,
+        help=f"Local comments file for --comments local (default: {COMMENTS_PATH}).",
+    )
+    export.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count).",
+    )
+    export.add_argument(
+        "--batch-size", type=int, default=64,
+        help="Transcripts per batch / Parquet row group (default: 64).",
+    )
+    export.set_defaults(func=_cmd_export)
+
+    refresh = commands.add_parser(
+        "refresh", help="Rebuild the corpus cache, reparsing only changed transcripts."
+    )
+    refresh.add_argument(
+        "--revision", default=None, help="Dataset revision on the Hub."
+    )
+    refresh.add_argument(
+        "--data-dir", default=None,
+        help="Local directory with <split>.jsonl or <split>.parquet files "
+        "instead of the Hub.",
+    )
+    refresh.add_argument(
+        "--corpus-dir", default=None,
+        help="Corpus cache directory (default: data/cache/corpus).",
+    )
+    refresh.set_defaults(func=_cmd_refresh)
+
+    duplicates = commands.add_parser(
+        "duplicates", help="Report near-duplicate transcripts of a corpus version."
+    )
+    duplicates.add_argument(
+        "--threshold", type=float, default=0.8,
+        help="Minimum estimated Jaccard similarity of user-turn 3-grams "
+        "(default: 0.8).",
+    )
+    duplicates.add_argument(
+        "--output", default=None, help="Write the report as CSV here."
+    )
+    duplicates.add_argument(
+        "--version", default=None, help="Corpus version (default: current)."
+    )
+    duplicates.add_argument(
+        "--corpus-dir", default=None,
+        help="Corpus cache directory (default: data/cache/corpus).",
+    )
+    duplicates.set_defaults(func=_cmd_duplicates)
+
+    build_static = commands.add_parser(
+        "build-static", help="Pre-render the viewer into a static site."
+    )
+    build_static.add_argument("output_dir", help="Directory to write the site into.")
+    build_static.add_argument(
+        "--version", default=None, help="Corpus version (default: current)."
+    )
+    build_static.add_argument(
+        "--corpus-dir", default=None,
+        help="Corpus cache directory (default: data/cache/corpus).",
+    )
+    build_static.add_argument(
+        "--comments-url", default=None,
+        help="Comments JSONL URL fetched by the page "
+        "(default: the file on GitHub; '' to disable).",
+    )
+    build_static.set_defaults(func=_cmd_build_static)
+
+    memcheck = commands.add_parser(
+        "memcheck", help="Check per-worker memory of the shared memory-mapped corpus."
+    )
+    memcheck.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 4],
+        help="Worker counts to compare (default: 1 4).",
+    )
+    memcheck.add_argument(
+        "--version", default=None, help="Corpus version (default: current)."
+    )
+    memcheck.add_argument(
+        "--corpus-dir", default=None,
+        help="Corpus cache directory (default: data/cache/corpus).",
+    )
+    memcheck.add_argument(
+        "--max-added-mb", type=float, default=8.0,
+        help="Fail if each added worker costs more than this (Pss) "
+        "with the mmap store.",
+    )
+    memcheck.set_defaults(func=_cmd_memcheck)
+
+    bench = commands.add_parser(
+        "bench", help="Benchmark hot paths on synthetic corpora."
+    )
+    bench.add_argument(
+        "--scales", type=float, nargs="+", default=[1, 10],
+        help="Corpus sizes relative to the real dataset (default: 1 10).",
+    )
+    bench.add_argument("--repeat", type=int, default=3, help="Runs per benchmark.")
+    bench.add_argument(
+        "--sample-size", type=int, default=None,
+        help="Transcripts for the per-transcript benchmarks (default: 1x corpus).",
+    )
+    bench.add_argument("--output", default=None, help="Write results JSON here.")
+    bench.add_argument(
+        "--baseline", default="benchmarks/baseline.json",
+        help="Baseline results to compare against.",
+    )
+    bench.add_argument(
+        "--save-baseline", action="store_true",
+        help="Store this run as the new baseline.",
+    )
+    bench.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed slowdown per item before reporting a regression (default: 0.2).",
+    )
+    bench.set_defaults(func=_cmd_bench)
+
+    timing_report = commands.add_parser(
+        "timing-report", help="Summarize exported dashboard timing spans."
+    )
+    timing_report.add_argument(
+        "path", help="JSONL file written via INTERVIEWER_TIMING_EXPORT."
+    )
+    timing_report.set_defaults(func=_cmd_timing_report)
+
+    loadtest = commands.add_parser(
+        "loadtest",
+        help="Simulate concurrent dashboard sessions against a fake GitHub API.",
+    )
+    loadtest.add_argument(
+        "--sessions", type=int, default=4, help="Concurrent sessions."
+    )
+    loadtest.add_argument(
+        "--actions", type=int, default=20, help="Actions per session."
+    )
+    loadtest.add_argument(
+        "--comment-rate", type=float, default=0.2,
+        help="Probability that an action submits a comment (default: 0.2).",
+    )
+    loadtest.add_argument(
+        "--api-latency", type=float, default=0.0,
+        help="Artificial latency of the fake API in seconds.",
+    )
+    loadtest.add_argument(
+        "--no-sha-check", action="store_true",
+        help="Let the fake API accept stale writes (shows lost comments).",
+    )
+    loadtest.add_argument(
+        "--scale", type=float, default=0.1,
+        help="Synthetic corpus size relative to the real dataset (default: 0.1).",
+    )
+    loadtest.add_argument(
+        "--real-dataset", action="store_true",
+        help="Load the real dataset instead of a synthetic corpus.",
+    )
+    loadtest.set_defaults(func=_cmd_loadtest)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
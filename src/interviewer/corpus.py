@@ -0,0 +1,314 @@
+"""Versioned on-disk corpus cache with incremental refresh.
+
+Each version lives in its own directory under ``CORPUS_DIR`` and is never
+modified after it is written:
+
+- ``manifest.json``: one entry per transcript (id, split, content hash and
+  per-transcript statistics) in dataset order
+- ``transcripts.parquet``: raw transcript text
+- ``messages.parquet``: parsed messages (same schema as ``interviewer export``)
+- ``similarity.npz``: the similar-interviews index
+- ``statistics.json``: per-split totals
+- ``store.bin``: compressed ``TranscriptStore`` that server processes
+  memory-map read-only, so they share one copy of the corpus
+
+The ``CURRENT`` file names the version new sessions should load and is
+replaced atomically, so sessions pinned to an older version keep working.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from interviewer.data import CACHE_DIR, SPLITS
+from interviewer.export import message_schema
+from interviewer.parser import Message, parse_transcript
+from interviewer.similarity import SimilarityIndex
+from interviewer.store import TranscriptStore
+
+
+CORPUS_DIR = CACHE_DIR / "corpus"
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 3
+
+_refresh_lock = threading.Lock()
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of ``refresh_corpus``; ids are transcript_ids."""
+
+    version: str
+    previous: str | None
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_noop(self) -> bool:
+        return self.version == self.previous
+
+
+def transcript_hash(text: str) -> str:
+    """Content hash used to detect changed transcripts."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def version_dir(version: str, root: Path = CORPUS_DIR) -> Path:
+    return Path(root) / version
+
+
+def current_version(root: Path = CORPUS_DIR) -> str | None:
+    """Version that new sessions should load, or None if none was built."""
+    path = Path(root) / CURRENT_FILE
+    if not path.exists():
+        return None
+    return path.read_text().strip() or None
+
+
+def read_manifest(version: str, root: Path = CORPUS_DIR) -> dict:
+    return json.loads((version_dir(version, root) / "manifest.json").read_text())
+
+
+def read_statistics(version: str, root: Path = CORPUS_DIR) -> dict:
+    return json.loads((version_dir(version, root) / "statistics.json").read_text())
+
+
+def _read_messages(path: Path) -> dict[str, list[Message]]:
+    messages: dict[str, list[Message]] = defaultdict(list)
+    table = pq.read_table(path, columns=["transcript_id", "role", "content"])
+    columns = (table.column(c).to_pylist() for c in table.column_names)
+    for tid, role, content in zip(*columns):
+        messages[tid].append(Message(role=role, content=content))
+    return messages
+
+
+def load_version(version: str, root: Path = CORPUS_DIR) -> list[dict]:
+    """Load a corpus version as the dashboard's interview records.
+
+    Returns:
+        List of dicts with keys: id, split, text, messages
+    """
+    directory = version_dir(version, root)
+    messages = _read_messages(directory / "messages.parquet")
+    transcripts = pq.read_table(directory / "transcripts.parquet").to_pylist()
+    return [
+        {
+            "id": row["transcript_id"],
+            "split": row["split"],
+            "text": row["text"],
+            "messages": messages.get(row["transcript_id"], []),
+        }
+        for row in transcripts
+    ]
+
+
+def load_store(version: str, root: Path = CORPUS_DIR, **kwargs) -> TranscriptStore:
+    """Load a corpus version into a compressed ``TranscriptStore``.
+
+    Keyword arguments are passed to ``TranscriptStore.build``.
+    """
+    return TranscriptStore.build(load_version(version, root), **kwargs)
+
+
+def open_store(version: str, root: Path = CORPUS_DIR) -> TranscriptStore:
+    """Memory-map the published store of a corpus version.
+
+    Versions written before stores were published are compressed in memory.
+    """
+    path = version_dir(version, root) / "store.bin"
+    if path.exists():
+        return TranscriptStore.open(path)
+    return load_store(version, root)
+
+
+def _transcript_stats(messages: list[Message]) -> dict:
+    user = [m.content for m in messages if m.role == "user"]
+    return {
+        "messages": len(messages),
+        "user_turns": len(user),
+        "user_words": sum(len(text.split()) for text in user),
+    }
+
+
+def _statistics(entries: list[dict]) -> dict:
+    totals = {}
+    for entry in entries:
+        split = totals.setdefault(
+            entry["split"],
+            {"transcripts": 0, "messages": 0, "user_turns": 0, "user_words": 0},
+        )
+        split["transcripts"] += 1
+        for key in ("messages", "user_turns", "user_words"):
+            split[key] += entry[key]
+    return totals
+
+
+def _write_version(
+    directory: Path,
+    manifest: dict,
+    rows: list[dict],
+    parsed: dict[str, list[Message]],
+    index: SimilarityIndex,
+    store: TranscriptStore,
+) -> None:
+    directory.mkdir(parents=True)
+    schema = pa.schema(
+        [("transcript_id", pa.string()), ("split", pa.string()), ("text", pa.string())]
+    )
+    pq.write_table(
+        pa.Table.from_pylist(
+            [{name: r[name] for name in schema.names} for r in rows], schema=schema
+        ),
+        directory / "transcripts.parquet",
+    )
+    columns = {name: [] for name in message_schema().names}
+    for row in rows:
+        for index_in_transcript, msg in enumerate(parsed[row["transcript_id"]]):
+            columns["transcript_id"].append(row["transcript_id"])
+            columns["split"].append(row["split"])
+            columns["message_index"].append(index_in_transcript)
+            columns["role"].append(msg.role)
+            columns["content"].append(msg.content)
+    pq.write_table(
+        pa.table(columns, schema=message_schema()), directory / "messages.parquet"
+    )
+    index.save(directory / "similarity.npz")
+    store.save(directory / "store.bin")
+    (directory / "statistics.json").write_text(
+        json.dumps(_statistics(manifest["transcripts"]), indent=2)
+    )
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+
+
+def _set_current(version: str, root: Path) -> None:
+    tmp = Path(root) / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(version + "\n")
+    os.replace(tmp, Path(root) / CURRENT_FILE)
+
+
+def _prune(root: Path, keep: int) -> None:
+    """Delete old versions, keeping the ``keep`` newest and the current one."""
+    current = current_version(root)
+    versions = sorted(
+        (p for p in Path(root).iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for path in versions[keep:]:
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def refresh_corpus(
+    dataset: Mapping[str, Iterable[dict]],
+    root: Path = CORPUS_DIR,
+    revision: str | None = None,
+    keep: int = KEEP_VERSIONS,
+) -> RefreshResult:
+    """Build a new corpus version, reparsing only added or changed transcripts.
+
+    Transcripts are matched to the current version by transcript_id and
+    content hash; unchanged ones reuse their parsed messages, statistics and
+    similarity signatures. The new version is written to a temporary
+    directory, moved into place and then published by replacing ``CURRENT``.
+
+    Args:
+        dataset: Mapping of split name to rows with 'transcript_id' and 'text'.
+        root: Directory holding the corpus versions.
+        revision: Dataset revision recorded in the manifest.
+        keep: Number of versions to keep on disk.
+    """
+    root = Path(root)
+    with _refresh_lock:
+        previous = current_version(root)
+        old_entries = {}
+        old_messages: dict[str, list[Message]] = {}
+        old_index = None
+        old_store = None
+        if previous is not None:
+            old_entries = {
+                e["transcript_id"]: e
+                for e in read_manifest(previous, root)["transcripts"]
+            }
+            old_dir = version_dir(previous, root)
+            old_messages = _read_messages(old_dir / "messages.parquet")
+            old_index = SimilarityIndex.load(old_dir / "similarity.npz")
+            if (old_dir / "store.bin").exists():
+                old_store = TranscriptStore.open(old_dir / "store.bin")
+
+        result = RefreshResult(version="", previous=previous)
+        rows, entries = [], []
+        unchanged = set()
+        parsed: dict[str, list[Message]] = {}
+        for split in SPLITS:
+            for row in dataset[split]:
+                tid, text = row["transcript_id"], row["text"]
+                digest = transcript_hash(text)
+                old = old_entries.get(tid)
+                if old is not None and old["hash"] == digest:
+                    parsed[tid] = old_messages.get(tid, [])
+                    entry = old
+                    unchanged.add(tid)
+                    result.unchanged += 1
+                else:
+                    parsed[tid] = parse_transcript(text)
+                    entry = {
+                        "transcript_id": tid,
+                        "hash": digest,
+                        **_transcript_stats(parsed[tid]),
+                    }
+                    (result.changed if old is not None else result.added).append(tid)
+                entries.append({**entry, "split": split})
+                rows.append({"transcript_id": tid, "split": split, "text": text})
+        result.removed = sorted(set(old_entries) - set(parsed))
+
+        listing = "".join(f"{e['transcript_id']}:{e['hash']}\n" for e in entries)
+        version = hashlib.blake2b(listing.encode("utf-8"), digest_size=6).hexdigest()
+        result.version = version
+        if version == previous:
+            return result
+
+        target = version_dir(version, root)
+        if not target.exists():
+            manifest = {
+                "version": version,
+                "revision": revision,
+                "created": datetime.now(timezone.utc).isoformat(),
+                "transcripts": entries,
+            }
+            index = SimilarityIndex.build(parsed, previous=old_index)
+            store = TranscriptStore.build(
+                (
+                    {"id": r["transcript_id"], "split": r["split"], "text": r["text"],
+                     "messages": parsed[r["transcript_id"]]}
+                    for r in rows
+                ),
+                previous=old_store,
+                unchanged=unchanged,
+            )
+            tmp = root / f".{version}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            _write_version(tmp, manifest, rows, parsed, index, store)
+            try:
+                os.replace(tmp, target)
+            except OSError:
+                # Another process published the same version first.
+                shutil.rmtree(tmp, ignore_errors=True)
+                if not target.exists():
+                    raise
+
+        _set_current(version, root)
+        _prune(root, keep)
+        return result
@@ -1,10 +1,19 @@
 """Data loading utilities for the Anthropic Interviewer dataset."""
 
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
 from datasets import load_dataset
 import pandas as pd
 
+from interviewer.parser import parse_transcript
+from interviewer.store import TranscriptStore
+
 
 DATASET_NAME = "Anthropic/AnthropicInterviewer"
+CACHE_DIR = Path(os.environ.get("INTERVIEWER_CACHE_DIR", Path("data") / "cache"))
+SPLITS = ["workforce", "creatives", "scientists"]
 
 
 def load_interviews(split: str | None = None) -> pd.DataFrame:
@@ -23,7 +32,7 @@ def load_interviews(split: str | None = None) -> pd.DataFrame:
 
     # Load all splits and combine
     dfs = []
-    for s in ["workforce", "creatives", "scientists"]:
+    for s in SPLITS:
         ds = load_dataset(DATASET_NAME, split=s)
         df = ds.to_pandas()
         dfs.append(df)
@@ -31,6 +40,29 @@ def load_interviews(split: str | None = None) -> pd.DataFrame:
     return pd.concat(dfs, ignore_index=True)
 
 
+def load_raw_dataset(revision: str | None = None, data_dir: str | Path | None = None):
+    """Load the raw dataset splits without parsing them.
+
+    Args:
+        revision: Optional Hub revision (branch, tag or commit) to load.
+        data_dir: Optional local directory with one '<split>.jsonl' or
+                  '<split>.parquet' file per split, used instead of the Hub.
+
+    Returns:
+        DatasetDict keyed by split.
+    """
+    if data_dir is None:
+        return load_dataset(DATASET_NAME, revision=revision)
+
+    data_dir = Path(data_dir)
+    if all((data_dir / f"{s}.parquet").exists() for s in SPLITS):
+        builder, suffix = "parquet", "parquet"
+    else:
+        builder, suffix = "json", "jsonl"
+    data_files = {s: str(data_dir / f"{s}.{suffix}") for s in SPLITS}
+    return load_dataset(builder, data_files=data_files)
+
+
 def get_split_counts() -> dict[str, int]:
     """Get the number of interviews in each split."""
     return {
@@ -38,3 +70,43 @@ def get_split_counts() -> dict[str, int]:
         "creatives": 125,
         "scientists": 125,
     }
+
+
+def iter_corpus(dataset: Mapping[str, Iterable[dict]]) -> Iterator[dict]:
+    """Parse the transcripts of a dataset one at a time, in split order.
+
+    Yields the records of ``parse_corpus``.
+    """
+    for split in SPLITS:
+        for row in dataset[split]:
+            yield {
+                "id": row["transcript_id"],
+                "split": split,
+                "text": row["text"],
+                "messages": parse_transcript(row["text"]),
+            }
+
+
+def parse_corpus(dataset: Mapping[str, Iterable[dict]]) -> list[dict]:
+    """Parse every transcript of a dataset into the dashboard's interview records.
+
+    Args:
+        dataset: Mapping of split name to rows with 'transcript_id' and 'text'
+                 (e.g. a ``DatasetDict``).
+
+    Returns:
+        List of dicts with keys: id, split, text, messages
+    """
+    return list(iter_corpus(dataset))
+
+
+def compress_corpus(
+    dataset: Mapping[str, Iterable[dict]], **kwargs
+) -> TranscriptStore:
+    """Parse a dataset into a compressed ``TranscriptStore``.
+
+    The store is a sequence of the same records as ``parse_corpus`` but keeps
+    each transcript compressed until it is accessed. Keyword arguments are
+    passed to ``TranscriptStore.build``.
+    """
+    return TranscriptStore.build(iter_corpus(dataset), **kwargs)
@@ -0,0 +1,218 @@
+"""Streaming export of parsed messages (optionally joined with comments)."""
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datasets import load_dataset
+
+from interviewer.data import DATASET_NAME, SPLITS
+from interviewer.parser import parse_transcript
+
+
+FORMATS = ("parquet", "jsonl", "csv")
+
+MESSAGE_COLUMNS = ["transcript_id", "split", "message_index", "role", "content"]
+
+COMMENT_TYPE = pa.list_(pa.struct([("text", pa.string()), ("timestamp", pa.string())]))
+
+
+def message_schema(with_comments: bool = False) -> pa.Schema:
+    """Arrow schema of the exported message table."""
+    fields = [
+        ("transcript_id", pa.string()),
+        ("split", pa.string()),
+        ("message_index", pa.int32()),
+        ("role", pa.string()),
+        ("content", pa.string()),
+    ]
+    if with_comments:
+        fields.append(("comments", COMMENT_TYPE))
+    return pa.schema(fields)
+
+
+def parse_batch(
+    transcript_ids: list[str],
+    texts: list[str],
+    split: str,
+    comments: dict[tuple[str, int], list[dict]] | None = None,
+) -> dict[str, list]:
+    """Parse a batch of transcripts into columns of the message table.
+
+    Message indices match the dashboard: position among all parsed messages.
+    """
+    columns: dict[str, list] = {name: [] for name in MESSAGE_COLUMNS}
+    if comments is not None:
+        columns["comments"] = []
+
+    for transcript_id, text in zip(transcript_ids, texts):
+        for index, msg in enumerate(parse_transcript(text)):
+            columns["transcript_id"].append(transcript_id)
+            columns["split"].append(split)
+            columns["message_index"].append(index)
+            columns["role"].append(msg.role)
+            columns["content"].append(msg.content)
+            if comments is not None:
+                columns["comments"].append([
+                    {"text": c["text"], "timestamp": c.get("timestamp", "")}
+                    for c in comments.get((transcript_id, index), [])
+                ])
+
+    return columns
+
+
+def _comments_for(
+    transcript_ids: list[str], comments_by_id: dict[str, dict] | None
+) -> dict[tuple[str, int], list[dict]] | None:
+    """Select the comments of a batch so only those are sent to the worker."""
+    if comments_by_id is None:
+        return None
+    selected = {}
+    for tid in transcript_ids:
+        selected.update(comments_by_id.get(tid, {}))
+    return selected
+
+
+def _iter_batches(splits: list[str], batch_size: int) -> Iterator[tuple[str, dict]]:
+    for split in splits:
+        ds = load_dataset(DATASET_NAME, split=split)
+        for batch in ds.select_columns(["transcript_id", "text"]).iter(batch_size):
+            yield split, batch
+
+
+class _ParquetSink:
+    def __init__(self, path: Path, with_comments: bool):
+        self.schema = message_schema(with_comments)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, columns: dict[str, list]) -> None:
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _JsonlSink:
+    def __init__(self, path: Path, with_comments: bool):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, columns: dict[str, list]) -> None:
+        names = list(columns)
+        for values in zip(*columns.values()):
+            self.file.write(json.dumps(dict(zip(names, values))) + "\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _CsvSink:
+    def __init__(self, path: Path, with_comments: bool):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.with_comments = with_comments
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(MESSAGE_COLUMNS + (["comments"] if with_comments else []))
+
+    def write(self, columns: dict[str, list]) -> None:
+        if self.with_comments:
+            comments = [json.dumps(c) for c in columns["comments"]]
+            columns = {**columns, "comments": comments}
+        self.writer.writerows(zip(*columns.values()))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+_SINKS = {"parquet": _ParquetSink, "jsonl": _JsonlSink, "csv": _CsvSink}
+
+
+def infer_format(path: str | Path) -> str:
+    """Guess the export format from a file suffix."""
+    suffix = Path(path).suffix.lstrip(".").lower()
+    if suffix in ("parquet", "pq"):
+        return "parquet"
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix == "csv":
+        return "csv"
+    raise ValueError(f"Cannot infer export format from '{path}', use one of {FORMATS}")
+
+
+def export_messages(
+    output: str | Path,
+    fmt: str | None = None,
+    splits: list[str] | None = None,
+    comments: dict[tuple[str, int], list[dict]] | None = None,
+    workers: int = 1,
+    batch_size: int = 64,
+    batches: Iterator[tuple[str, dict]] | None = None,
+) -> int:
+    """Export the parsed message table, streaming batches through workers.
+
+    At most ``2 * workers`` batches are in flight, and each batch is written
+    (one Parquet row group, or its lines of JSONL/CSV) as soon as it is parsed,
+    in input order.
+
+    Args:
+        output: Output file path.
+        fmt: 'parquet', 'jsonl' or 'csv'. Inferred from the suffix if None.
+        splits: Splits to export. Defaults to all splits.
+        comments: Comments grouped by (transcript_id, message_index) to join
+                  onto each message. If None, no comments column is written.
+        workers: Number of worker processes. 1 parses in-process.
+        batch_size: Transcripts per batch.
+        batches: Optional iterable of (split, {"transcript_id": [...], "text": [...]})
+                 to export instead of the Hugging Face dataset.
+
+    Returns:
+        Number of message rows written.
+    """
+    fmt = fmt or infer_format(output)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', use one of {FORMATS}")
+    if batches is None:
+        batches = _iter_batches(splits or SPLITS, batch_size)
+
+    comments_by_id = None
+    if comments is not None:
+        comments_by_id = {}
+        for (tid, index), items in comments.items():
+            comments_by_id.setdefault(tid, {})[(tid, index)] = items
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sink = _SINKS[fmt](output, comments is not None)
+    rows = 0
+    try:
+        if workers <= 1:
+            for split, batch in batches:
+                ids = batch["transcript_id"]
+                batch_comments = _comments_for(ids, comments_by_id)
+                columns = parse_batch(ids, batch["text"], split, batch_comments)
+                sink.write(columns)
+                rows += len(columns["transcript_id"])
+            return rows
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for split, batch in batches:
+                ids = batch["transcript_id"]
+                batch_comments = _comments_for(ids, comments_by_id)
+                pending.append(
+                    pool.submit(parse_batch, ids, batch["text"], split, batch_comments)
+                )
+                if len(pending) >= 2 * workers:
+                    columns = pending.popleft().result()
+                    sink.write(columns)
+                    rows += len(columns["transcript_id"])
+            while pending:
+                columns = pending.popleft().result()
+                sink.write(columns)
+                rows += len(columns["transcript_id"])
+        return rows
+    finally:
+        sink.close()
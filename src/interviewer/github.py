@@ -2,10 +2,14 @@
 
 import json
 import base64
+import os
 from datetime import datetime, timezone
+from pathlib import Path
 import requests
 import streamlit as st
 
+from interviewer import timing
+
 
 REPO_OWNER = "pssachdeva"
 REPO_NAME = "interviewer"
@@ -14,50 +18,85 @@ BRANCH = "main"
 
 
 def get_github_token() -> str | None:
-    """Get GitHub token from Streamlit secrets."""
+    """Get GitHub token from Streamlit secrets or the GITHUB_TOKEN env var."""
     try:
         return st.secrets["GITHUB_TOKEN"]
     except (KeyError, FileNotFoundError):
-        return None
+        return os.environ.get("GITHUB_TOKEN")
 
 
-def load_comments() -> dict[tuple[str, int], list[dict]]:
-    """Load all comments from GitHub, grouped by (transcript_id, message_index)."""
-    token = get_github_token()
-    if not token:
+def get_contents_url() -> str:
+    """URL of the comments file in the GitHub contents API.
+
+    The API base can be overridden with GITHUB_API_URL (e.g. a local fake).
+    """
+    api_url = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+    return f"{api_url}/repos/{REPO_OWNER}/{REPO_NAME}/contents/{COMMENTS_PATH}"
+
+
+def parse_comments(content: str) -> dict[tuple[str, int], list[dict]]:
+    """Parse comments JSONL, grouped by (transcript_id, message_index)."""
+    comments: dict[tuple[str, int], list[dict]] = {}
+    for line in content.strip().split("\n"):
+        if not line:
+            continue
+        comment = json.loads(line)
+        key = (comment["transcript_id"], comment["message_index"])
+        if key not in comments:
+            comments[key] = []
+        comments[key].append(comment)
+
+    return comments
+
+
+def load_local_comments(
+    path: str | Path = COMMENTS_PATH,
+) -> dict[tuple[str, int], list[dict]]:
+    """Load comments from a local JSONL file, grouped like ``load_comments``."""
+    path = Path(path)
+    if not path.exists():
         return {}
+    return parse_comments(path.read_text(encoding="utf-8"))
+
 
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{COMMENTS_PATH}"
+def fetch_comments(token: str) -> dict[tuple[str, int], list[dict]]:
+    """Fetch all comments from GitHub, grouped by (transcript_id, message_index).
+
+    Raises:
+        requests.HTTPError: If the contents API returns an error other than 404.
+    """
+    url = get_contents_url()
     headers = {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
 
+    timing.incr("github_api_calls")
     response = requests.get(url, headers=headers, params={"ref": BRANCH})
 
     if response.status_code == 404:
         # File doesn't exist yet
         return {}
 
-    if response.status_code != 200:
-        st.error(f"Failed to load comments: {response.status_code}")
-        return {}
-
+    response.raise_for_status()
     data = response.json()
     content = base64.b64decode(data["content"]).decode("utf-8")
 
-    # Parse JSONL
-    comments: dict[tuple[str, int], list[dict]] = {}
-    for line in content.strip().split("\n"):
-        if not line:
-            continue
-        comment = json.loads(line)
-        key = (comment["transcript_id"], comment["message_index"])
-        if key not in comments:
-            comments[key] = []
-        comments[key].append(comment)
+    with timing.span("parse_comments"):
+        return parse_comments(content)
 
-    return comments
+
+def load_comments() -> dict[tuple[str, int], list[dict]]:
+    """Load all comments from GitHub, grouped by (transcript_id, message_index)."""
+    token = get_github_token()
+    if not token:
+        return {}
+
+    try:
+        return fetch_comments(token)
+    except requests.HTTPError as e:
+        st.error(f"Failed to load comments: {e.response.status_code}")
+        return {}
 
 
 def save_comment(transcript_id: str, message_index: int, text: str) -> bool:
@@ -76,13 +115,14 @@ def save_comment(transcript_id: str, message_index: int, text: str) -> bool:
     }
     new_line = json.dumps(comment)
 
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{COMMENTS_PATH}"
+    url = get_contents_url()
     headers = {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json",
     }
 
     # Get current file (if exists) to get SHA
+    timing.incr("github_api_calls")
     response = requests.get(url, headers=headers, params={"ref": BRANCH})
 
     if response.status_code == 404:
@@ -108,6 +148,7 @@ def save_comment(transcript_id: str, message_index: int, text: str) -> bool:
     if sha:
         payload["sha"] = sha
 
+    timing.incr("github_api_calls")
     response = requests.put(url, headers=headers, json=payload)
 
     if response.status_code in (200, 201):
@@ -0,0 +1,388 @@
+"""Multi-session load test of the dashboard against a local fake GitHub API.
+
+Each simulated session is a Streamlit ``AppTest`` of ``dashboard/app.py``
+running in its own process (``AppTest`` is not thread-safe), so sessions
+really do race each other on comment writes. Comment reads and writes go to
+``FakeGitHub``, a local stand-in for the contents API used by
+``interviewer.github`` (selected through GITHUB_API_URL).
+"""
+
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from interviewer.github import COMMENTS_PATH, REPO_NAME, REPO_OWNER
+
+
+def _find_app() -> Path:
+    """Locate dashboard/app.py next to the package (source tree or installed wheel)."""
+    package_dir = Path(__file__).resolve().parent
+    for root in (package_dir.parents[1], package_dir.parent):
+        path = root / "dashboard" / "app.py"
+        if path.exists():
+            return path
+    return package_dir.parents[1] / "dashboard" / "app.py"
+
+
+APP_PATH = _find_app()
+
+_CONTENTS_PATH = f"/repos/{REPO_OWNER}/{REPO_NAME}/contents/{COMMENTS_PATH}"
+
+
+class FakeGitHub:
+    """In-memory stand-in for the GitHub contents API serving one file.
+
+    Like GitHub, a PUT whose ``sha`` does not match the current file is
+    rejected with 409. With ``check_sha=False`` stale writes overwrite the
+    file instead, which is how lost comments show up in the report.
+    """
+
+    def __init__(
+        self, content: str | None = "", check_sha: bool = True, latency: float = 0.0
+    ):
+        self.content = content
+        self.check_sha = check_sha
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.rejected: list[dict] = []
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def sha(self) -> str | None:
+        if self.content is None:
+            return None
+        return hashlib.sha1(self.content.encode("utf-8")).hexdigest()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve on a free localhost port in a background thread; return its URL."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def comments(self) -> list[dict]:
+        return [json.loads(line) for line in (self.content or "").splitlines() if line]
+
+    def _get(self) -> tuple[int, dict]:
+        with self._lock:
+            if self.content is None:
+                return 404, {"message": "Not Found"}
+            encoded = base64.b64encode(self.content.encode("utf-8")).decode("utf-8")
+            return 200, {"content": encoded, "sha": self.sha}
+
+    def _put(self, payload: dict) -> tuple[int, dict]:
+        new_content = base64.b64decode(payload["content"]).decode("utf-8")
+        with self._lock:
+            if self.check_sha and payload.get("sha") != self.sha:
+                current = set((self.content or "").splitlines())
+                self.rejected.extend(
+                    json.loads(line) for line in new_content.splitlines()
+                    if line and line not in current
+                )
+                return 409, {"message": "sha does not match"}
+            created = self.content is None
+            self.content = new_content
+            return (201 if created else 200), {"content": {"sha": self.sha}}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method: str):
+                with fake._lock:
+                    fake.calls[method] += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if self.path.split("?")[0] != _CONTENTS_PATH:
+                    self._respond(404, {"message": "Not Found"})
+                elif method == "GET":
+                    self._respond(*fake._get())
+                else:
+                    length = int(self.headers.get("Content-Length", 0))
+                    self._respond(*fake._put(json.loads(self.rfile.read(length))))
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_PUT(self):
+                self._handle("PUT")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class _Session:
+    def __init__(self, session_id: int, seed: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.id = session_id
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.app.secrets["GITHUB_TOKEN"] = "load-test"
+        self.latencies: list[float] = []
+        self.attempted: list[str] = []
+        self.errors: list[str] = []
+
+    def run(self, element=None) -> None:
+        start = time.perf_counter()
+        if element is None:
+            self.app.run()
+        else:
+            element.run()
+        self.latencies.append(time.perf_counter() - start)
+        self.errors.extend(str(e.value) for e in self.app.exception)
+
+    def next(self) -> None:
+        self.run(self.app.button(key="next_top").click())
+
+    def comment(self) -> None:
+        add_buttons = [
+            b for b in self.app.button if b.key and re.fullmatch(r"add_\d+", b.key)
+        ]
+        if not add_buttons:
+            return self.next()
+        button = self.rng.choice(add_buttons)
+        msg_idx = button.key.split("_")[1]
+        self.run(button.click())
+        text = f"load-test session {self.id} comment {len(self.attempted)}"
+        self.app.text_area(key=f"comment_text_{msg_idx}").input(text)
+        self.attempted.append(text)
+        self.run(self.app.button(key=f"submit_{msg_idx}").click())
+
+
+def _session_process(session_id, config, api_url, cache_dir, ready, go, results):
+    """Run one session: warm the caches, measure its memory, then act.
+
+    Reports on ``ready`` once loaded and on ``results`` when done; a failure
+    is reported on whichever of the two the parent is reading, with its traceback.
+    """
+    channel = ready
+    try:
+        os.environ["GITHUB_API_URL"] = api_url
+        os.environ["INTERVIEWER_CACHE_DIR"] = cache_dir
+
+        # A first session loads the process-wide caches (corpus, comments), so
+        # the measured session's memory excludes data shared between sessions.
+        _Session(-1, 0, config["timeout"]).run()
+        rss_before = _rss_bytes()
+        session = _Session(session_id, config["seed"] + session_id, config["timeout"])
+        session.run()
+        rss_session = _rss_bytes() - rss_before
+
+        ready.put(session_id)
+        channel = results
+        if not go.wait(config["start_timeout"]):
+            raise TimeoutError("other sessions did not start in time")
+        for _ in range(config["actions"]):
+            if session.rng.random() < config["comment_rate"]:
+                session.comment()
+            else:
+                session.next()
+    except BaseException:
+        channel.put({"session": session_id, "failed": traceback.format_exc()})
+        raise
+
+    results.put({
+        "session": session_id,
+        "latencies": session.latencies,
+        "attempted": session.attempted,
+        "errors": session.errors,
+        "rss_session": rss_session,
+        "rss_process": _rss_bytes(),
+    })
+
+
+def _collect(
+    processes: list,
+    channel,
+    expected: set[int],
+    deadline: float,
+    failed: dict[int, str],
+) -> list:
+    """Read one message per session in ``expected`` from ``channel``.
+
+    Sessions whose process exited without reporting, or that have not
+    reported by ``deadline``, are added to ``failed`` instead.
+    """
+    messages = []
+    pending = set(expected) - set(failed)
+    exited_at: dict[int, float] = {}
+    while pending:
+        try:
+            message = channel.get(timeout=0.5)
+        except queue.Empty:
+            now = time.monotonic()
+            for i in list(pending):
+                if processes[i].exitcode is None:
+                    continue
+                # Give a message sent just before exiting time to arrive.
+                if now - exited_at.setdefault(i, now) > 5:
+                    code = processes[i].exitcode
+                    failed[i] = f"session process exited with code {code}"
+                    pending.discard(i)
+            if now > deadline:
+                for i in pending:
+                    failed[i] = "session timed out"
+                break
+            continue
+        session_id = message["session"] if isinstance(message, dict) else message
+        if isinstance(message, dict) and "failed" in message:
+            failed[session_id] = message["failed"]
+        else:
+            messages.append(message)
+        pending.discard(session_id)
+    return messages
+
+
+def _mean_mb(values: list[int]) -> float | None:
+    return float(np.mean(values)) / 2**20 if values else None
+
+
+def run_load_test(
+    sessions: int = 4,
+    actions: int = 20,
+    comment_rate: float = 0.2,
+    check_sha: bool = True,
+    api_latency: float = 0.0,
+    scale: float = 0.1,
+    real_dataset: bool = False,
+    timeout: float = 120,
+    start_timeout: float = 300,
+    seed: int = 0,
+) -> dict:
+    """Drive concurrent dashboard sessions; report latency, memory and comment writes.
+
+    Args:
+        sessions: Number of concurrent simulated sessions.
+        actions: Actions per session; each is a Next click or, with
+                 probability ``comment_rate``, adding a comment.
+        comment_rate: Probability that an action submits a comment.
+        check_sha: Whether the fake API rejects stale writes with 409.
+        api_latency: Seconds of artificial latency per API request.
+        scale: Synthetic corpus size relative to the real dataset.
+        real_dataset: Load the real dataset instead of a synthetic corpus.
+        timeout: Per-rerun timeout in seconds.
+        start_timeout: Seconds each session may take to load before the run
+                       starts without it.
+        seed: Seed for the sessions' random choices.
+
+    Returns:
+        Report dict (latencies in ms, memory in MB).
+    """
+    config = {
+        "actions": actions,
+        "comment_rate": comment_rate,
+        "timeout": timeout,
+        "start_timeout": start_timeout,
+        "seed": seed,
+    }
+    ctx = multiprocessing.get_context("spawn")
+    ready, go, results = ctx.Queue(), ctx.Event(), ctx.Queue()
+
+    # Build the corpus once in a scratch cache that the sessions load from.
+    from interviewer.corpus import refresh_corpus
+    from interviewer.data import load_raw_dataset
+    from interviewer.synthetic import synthetic_dataset
+
+    cache_dir = tempfile.TemporaryDirectory(prefix="interviewer-loadtest-")
+    dataset = load_raw_dataset() if real_dataset else synthetic_dataset(scale)
+    refresh_corpus(dataset, root=Path(cache_dir.name) / "corpus")
+
+    fake = FakeGitHub(content="", check_sha=check_sha, latency=api_latency)
+    api_url = fake.start()
+    failed: dict[int, str] = {}
+    try:
+        processes = [
+            ctx.Process(
+                target=_session_process,
+                args=(i, config, api_url, cache_dir.name, ready, go, results),
+            )
+            for i in range(sessions)
+        ]
+        for process in processes:
+            process.start()
+        everyone = set(range(sessions))
+        _collect(processes, ready, everyone, time.monotonic() + start_timeout, failed)
+        fake.calls.clear()
+        go.set()
+        start = time.perf_counter()
+        # Worst case every action is a comment: three reruns of up to ``timeout``.
+        run_deadline = time.monotonic() + timeout * (3 * actions + 1)
+        reports = _collect(processes, results, everyone, run_deadline, failed)
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+    finally:
+        fake.stop()
+        cache_dir.cleanup()
+
+    latencies = np.array([t for r in reports for t in r["latencies"]]) * 1000
+    attempted = {text for r in reports for text in r["attempted"]}
+    stored = {c["text"] for c in fake.comments()}
+    rejected = {c["text"] for c in fake.rejected}
+    api_calls = sum(fake.calls.values())
+
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "elapsed_s": elapsed,
+        "failed_sessions": {str(i): error for i, error in sorted(failed.items())},
+        "rerun_ms": {
+            f"p{p}": float(np.percentile(latencies, p)) if len(latencies) else None
+            for p in (50, 95, 99)
+        },
+        "rss_per_session_mb": _mean_mb([r["rss_session"] for r in reports]),
+        "rss_per_process_mb": _mean_mb([r["rss_process"] for r in reports]),
+        "api_calls": dict(fake.calls),
+        "api_calls_per_minute": api_calls / (elapsed / 60),
+        "comments_attempted": len(attempted),
+        "comments_stored": len(attempted & stored),
+        "comments_conflicted": len(attempted & rejected),
+        "comments_lost": len(attempted - stored - rejected),
+        "errors": sorted({e for r in reports for e in r["errors"]}),
+    }
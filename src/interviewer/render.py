@@ -0,0 +1,52 @@
+"""HTML markup for transcript chat bubbles, shared by the dashboard and exports."""
+
+from functools import cache
+from pathlib import Path
+
+from interviewer.parser import Message
+
+
+CSS_PATH = Path(__file__).with_name("style.css")
+
+
+@cache
+def app_css() -> str:
+    """The dashboard's stylesheet (chat bubbles, comments, header, layout)."""
+    return CSS_PATH.read_text(encoding="utf-8")
+
+
+def escape_content(text: str) -> str:
+    """Escape HTML in message text and convert newlines to <br>."""
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.replace("\n", "<br>")
+
+
+def message_html(msg: Message) -> str:
+    """Render a message as a standalone chat bubble."""
+    content = escape_content(msg.content)
+    if msg.role == "assistant":
+        return (
+            f'<div class="bubble-container assistant">'
+            f'<div class="chat-bubble assistant-bubble">{content}</div>'
+            f'</div>'
+        )
+    return (
+        f'<div class="bubble-container user">'
+        f'<div class="chat-bubble user-bubble">{content}</div>'
+        f'</div>'
+    )
+
+
+def comment_html(comment: dict) -> str:
+    """Render a comment bubble with its date."""
+    timestamp = comment.get("timestamp", "")[:10]  # Just the date
+    return (
+        f'<div class="comment-bubble">{escape_content(comment["text"])}'
+        f'<div class="comment-timestamp">{timestamp}</div>'
+        f'</div>'
+    )
+
+
+def transcript_html(messages: list[Message]) -> str:
+    """Render all messages of a transcript as chat bubbles."""
+    return "".join(message_html(msg) for msg in messages)
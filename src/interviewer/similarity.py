@@ -0,0 +1,442 @@
+"""Similar-interview index over interview user turns.
+
+Similar interviews are ranked by TF-IDF cosine similarity of the words in the
+user turns, which picks up shared topics between different interviewees. Only
+candidates from an inverted index over each transcript's most distinctive
+terms are scored, so the cost grows with the corpus rather than its square.
+Near-duplicates (copies and light edits) are found separately with MinHash
+signatures of word 3-grams and LSH banding.
+"""
+
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from interviewer.parser import Message
+
+
+NUM_PERM = 128
+NUM_BANDS = 32
+SHINGLE_SIZE = 3
+TOP_K = 5
+
+# Terms in fewer than MIN_DF transcripts cannot link two interviews, and terms
+# in more than MAX_DF of them are too common to say anything about the topic.
+MIN_DF = 2
+MAX_DF = 0.5
+
+# Similar interviews are scored exactly for the _CANDIDATES best matches per
+# transcript over an inverted index that keeps the _MAX_POSTINGS
+# highest-weighted transcripts per term, which bounds the work per term.
+_QUERY_TERMS = 16
+_MAX_POSTINGS = 128
+_CANDIDATES = 32
+
+# Values held per block of rows while finding and scoring candidates.
+_BLOCK_BUDGET = 1 << 23
+
+# Mersenne prime for universal hashing; shingle ids and coefficients stay below
+# it so a * x + b fits in uint64 without overflow.
+_PRIME = np.uint64((1 << 31) - 1)
+_MAX_HASH = np.uint64((1 << 31) - 1)
+_SEED = 1234
+
+_WORD = re.compile(r"\w+")
+
+
+def user_text(messages: list[Message]) -> str:
+    """Concatenate the user turns of a parsed transcript."""
+    return "\n".join(m.content for m in messages if m.role == "user")
+
+
+def content_hash(text: str) -> str:
+    """Short stable hash used to detect changed transcripts."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _hash_grams(grams: list[str]) -> list[int]:
+    return [zlib.crc32(g.encode("utf-8")) & 0x7FFFFFFF for g in grams]
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hash the word k-grams of a text into unique 31-bit ids."""
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    ids = set(_hash_grams(grams))
+    return np.fromiter(ids, dtype=np.uint64, count=len(ids))
+
+
+def term_counts(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Hash the words of a text into sorted 31-bit term ids and their counts."""
+    ids = np.array(_hash_grams(_WORD.findall(text.lower())), dtype=np.uint32)
+    terms, counts = np.unique(ids, return_counts=True)
+    return terms, counts.astype(np.uint32)
+
+
+def _permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def minhash_signature(shingle_ids: np.ndarray, num_perm: int = NUM_PERM) -> np.ndarray:
+    """Compute the MinHash signature of a set of shingle ids."""
+    if len(shingle_ids) == 0:
+        return np.full(num_perm, _MAX_HASH, dtype=np.uint64)
+    a, b = _permutations(num_perm)
+    return ((a * shingle_ids[None, :] + b) % _PRIME).min(axis=1)
+
+
+@dataclass
+class SimilarityIndex:
+    """Precomputed top-k similar interviews and near-duplicate signatures.
+
+    ``neighbors[i]`` holds row indices into ``ids`` (padded with -1) and
+    ``scores[i]`` the TF-IDF cosine similarity of the user turns. The term
+    counts of transcript ``i`` are ``term_ids[term_ptr[i]:term_ptr[i + 1]]``
+    and ``term_counts[...]``; ``signatures`` are the MinHash signatures used
+    for near-duplicate detection.
+    """
+
+    ids: list[str]
+    hashes: list[str]
+    signatures: np.ndarray
+    term_ptr: np.ndarray
+    term_ids: np.ndarray
+    term_counts: np.ndarray
+    neighbors: np.ndarray
+    scores: np.ndarray
+    num_bands: int = NUM_BANDS
+    _positions: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._positions = {tid: i for i, tid in enumerate(self.ids)}
+
+    @property
+    def num_perm(self) -> int:
+        return self.signatures.shape[1]
+
+    @classmethod
+    def build(
+        cls,
+        transcripts: Mapping[str, list[Message]],
+        previous: "SimilarityIndex | None" = None,
+        num_perm: int = NUM_PERM,
+        num_bands: int = NUM_BANDS,
+        top_k: int = TOP_K,
+    ) -> "SimilarityIndex":
+        """Build an index, reusing the features of unchanged transcripts.
+
+        Term weights depend on the whole corpus, so similarities are always
+        recomputed; only tokenizing and MinHashing are skipped for
+        transcripts whose user turns hash the same as in ``previous``.
+
+        Args:
+            transcripts: Mapping of transcript_id to parsed messages.
+            previous: Earlier index to reuse term counts and signatures from.
+            num_perm: Number of MinHash permutations.
+            num_bands: Number of LSH bands for near-duplicates (must divide num_perm).
+            top_k: Number of similar interviews stored per transcript.
+        """
+        if num_perm % num_bands:
+            raise ValueError("num_bands must divide num_perm")
+        if previous is not None and previous.num_perm != num_perm:
+            previous = None
+
+        ids = list(transcripts)
+        hashes = []
+        signatures = np.empty((len(ids), num_perm), dtype=np.uint64)
+        terms, counts = [], []
+        for row, tid in enumerate(ids):
+            text = user_text(transcripts[tid])
+            digest = content_hash(text)
+            hashes.append(digest)
+            old = previous._positions.get(tid) if previous is not None else None
+            if old is not None and previous.hashes[old] == digest:
+                signatures[row] = previous.signatures[old]
+                start, end = previous.term_ptr[old], previous.term_ptr[old + 1]
+                terms.append(previous.term_ids[start:end])
+                counts.append(previous.term_counts[start:end])
+            else:
+                signatures[row] = minhash_signature(shingles(text), num_perm)
+                row_terms, row_counts = term_counts(text)
+                terms.append(row_terms)
+                counts.append(row_counts)
+
+        term_ptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        term_ptr[1:] = np.cumsum([len(t) for t in terms])
+        term_ids = np.concatenate(terms) if terms else np.empty(0, dtype=np.uint32)
+        all_counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.uint32)
+        neighbors, scores = _tfidf_neighbors(term_ptr, term_ids, all_counts, top_k)
+        return cls(
+            ids,
+            hashes,
+            signatures,
+            term_ptr,
+            term_ids,
+            all_counts,
+            neighbors,
+            scores,
+            num_bands,
+        )
+
+    def similar(self, transcript_id: str) -> list[tuple[str, float]]:
+        """Return the precomputed similar interviews of a transcript, best first."""
+        row = self._positions.get(transcript_id)
+        if row is None:
+            return []
+        return [
+            (self.ids[j], float(s))
+            for j, s in zip(self.neighbors[row], self.scores[row])
+            if j >= 0
+        ]
+
+    def near_duplicates(self, threshold: float = 0.8) -> list[tuple[str, str, float]]:
+        """List transcript pairs whose estimated 3-gram Jaccard is at least threshold.
+
+        Every pair sharing an LSH band is scored, so groups of copies of any
+        size are reported in full.
+        """
+        pairs = _candidate_pairs(self.signatures, self.num_bands)
+        if len(pairs) == 0:
+            return []
+        left, right = pairs[:, 0], pairs[:, 1]
+        sims = (self.signatures[left] == self.signatures[right]).mean(axis=1)
+        keep = np.flatnonzero(sims >= threshold)
+        return sorted(
+            ((self.ids[left[k]], self.ids[right[k]], float(sims[k])) for k in keep),
+            key=lambda p: -p[2],
+        )
+
+    def near_duplicate_report(self, threshold: float = 0.8) -> pd.DataFrame:
+        """Near-duplicate pairs as a DataFrame."""
+        return pd.DataFrame(
+            self.near_duplicates(threshold),
+            columns=["transcript_id", "other_id", "similarity"],
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to an .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            ids=np.array(self.ids, dtype=str),
+            hashes=np.array(self.hashes, dtype=str),
+            signatures=self.signatures,
+            term_ptr=self.term_ptr,
+            term_ids=self.term_ids,
+            term_counts=self.term_counts,
+            neighbors=self.neighbors,
+            scores=self.scores,
+            num_bands=np.array(self.num_bands),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SimilarityIndex | None":
+        """Load an index written by ``save``, or None if it does not exist."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as f:
+            return cls(
+                ids=f["ids"].tolist(),
+                hashes=f["hashes"].tolist(),
+                signatures=f["signatures"],
+                term_ptr=f["term_ptr"],
+                term_ids=f["term_ids"],
+                term_counts=f["term_counts"],
+                neighbors=f["neighbors"],
+                scores=f["scores"],
+                num_bands=int(f["num_bands"]),
+            )
+
+
+def _tfidf_neighbors(
+    term_ptr: np.ndarray, term_ids: np.ndarray, counts: np.ndarray, top_k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the top-k rows of each row by TF-IDF cosine similarity.
+
+    Weights are sublinear term frequency times smoothed IDF, L2-normalised
+    per row. Rather than comparing every pair of rows, candidates come from
+    an inverted index that keeps the ``_MAX_POSTINGS`` highest-weighted rows
+    per term; the best ``_CANDIDATES`` per row by partial dot product are
+    then scored exactly.
+    """
+    n = len(term_ptr) - 1
+    neighbors = np.full((n, top_k), -1, dtype=np.int32)
+    scores = np.zeros((n, top_k), dtype=np.float32)
+    if n < 2:
+        return neighbors, scores
+
+    rows, cols, weights, num_terms = _tfidf_weights(term_ptr, term_ids, counts)
+    if num_terms == 0:
+        return neighbors, scores
+    left, right = _candidates(rows, cols, weights, n, num_terms)
+    exact = _pair_scores(rows, cols, weights, left, right, n, num_terms)
+
+    found = exact > 1e-6
+    left, right, exact = left[found], right[found], exact[found]
+    order, rank = _top_within(left, exact)
+    left, right, exact = left[order], right[order], exact[order]
+    best = rank < top_k
+    neighbors[left[best], rank[best]] = right[best]
+    scores[left[best], rank[best]] = exact[best]
+    return neighbors, scores
+
+
+def _tfidf_weights(
+    term_ptr: np.ndarray, term_ids: np.ndarray, counts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Normalised TF-IDF weights as (row, column, weight) triples sorted by row.
+
+    Columns index the terms kept by the MIN_DF/MAX_DF cut; also returns
+    their number.
+    """
+    n = len(term_ptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(term_ptr))
+    _, cols = np.unique(term_ids, return_inverse=True)
+    df = np.bincount(cols)
+    keep = (df[cols] >= MIN_DF) & (df[cols] <= max(MAX_DF * n, MIN_DF))
+    rows, tf = rows[keep], counts[keep].astype(np.float64)
+    kept_terms, cols = np.unique(cols[keep], return_inverse=True)
+    df = df[kept_terms]
+
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = (1 + np.log(tf)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=n))
+    weights = (weights / np.where(norms > 0, norms, 1)[rows]).astype(np.float32)
+    return rows, cols, weights, len(df)
+
+
+def _top_within(
+    groups: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Order entries by group, then by descending value.
+
+    Values are weights or dot products of unit vectors, so they lie in
+    [0, 1] and one sort on ``2 * group - value`` does both. Returns the
+    order and the rank of each ordered entry within its group.
+    """
+    order = np.argsort(groups * 2.0 - values)
+    sorted_groups = groups[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_groups, sorted_groups)
+    return order, rank
+
+
+def _row_blocks(cost: np.ndarray) -> list[tuple[int, int]]:
+    """Split rows into consecutive blocks of about ``_BLOCK_BUDGET`` total cost."""
+    block = np.cumsum(cost) // _BLOCK_BUDGET
+    bounds = [0, *(np.flatnonzero(np.diff(block)) + 1).tolist(), len(cost)]
+    return [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if lo < hi]
+
+
+def _candidates(
+    rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, n: int, num_terms: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Candidate neighbour pairs (left, right), sorted by left row.
+
+    Each term keeps postings for its ``_MAX_POSTINGS`` highest-weighted rows,
+    so a term shared by many rows adds a bounded number of pairs. Pairs are
+    ranked by their dot product over the kept postings and the best
+    ``_CANDIDATES`` are kept per row.
+    """
+    order, rank = _top_within(cols, weights)
+    keep = order[rank < _MAX_POSTINGS]
+    p_rows, p_cols, p_weights = rows[keep], cols[keep], weights[keep]
+    lengths = np.bincount(p_cols, minlength=num_terms)
+    starts = np.cumsum(lengths) - lengths
+
+    # Query with each row's highest-weighted terms.
+    order, rank = _top_within(rows, weights)
+    keep = order[rank < _QUERY_TERMS]
+    q_rows, q_cols, q_weights = rows[keep], cols[keep], weights[keep]
+    row_ptr = np.searchsorted(q_rows, np.arange(n + 1))
+    fanout = np.bincount(q_rows, weights=lengths[q_cols], minlength=n)
+
+    lefts, rights = [], []
+    for lo, hi in _row_blocks(fanout):
+        query = np.arange(row_ptr[lo], row_ptr[hi])
+        size = lengths[q_cols[query]]
+        mine = np.repeat(query, size)
+        offset = np.arange(len(mine)) - np.repeat(np.cumsum(size) - size, size)
+        other = np.repeat(starts[q_cols[query]], size) + offset
+        left, right = q_rows[mine], p_rows[other]
+        distinct = left != right
+        key = left[distinct].astype(np.int64) * n + right[distinct]
+        pairs, inverse = np.unique(key, return_inverse=True)
+        partial = np.bincount(
+            inverse, weights=(q_weights[mine] * p_weights[other])[distinct]
+        )
+        order, rank = _top_within(pairs // n, partial)
+        best = order[rank < _CANDIDATES]
+        lefts.append(pairs[best] // n)
+        rights.append(pairs[best] % n)
+    if not lefts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(lefts), np.concatenate(rights)
+
+
+def _pair_scores(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray,
+    n: int,
+    num_terms: int,
+) -> np.ndarray:
+    """Exact cosine similarity of each (left, right) pair; pairs sorted by left."""
+    row_ptr = np.searchsorted(rows, np.arange(n + 1))
+    row_len = np.diff(row_ptr)
+    pair_ptr = np.searchsorted(left, np.arange(n + 1))
+    cost = num_terms + np.bincount(left, weights=row_len[right], minlength=n)
+
+    exact = np.zeros(len(left), dtype=np.float32)
+    for lo, hi in _row_blocks(cost):
+        first, last = pair_ptr[lo], pair_ptr[hi]
+        if first == last:
+            continue
+        dense = np.zeros((hi - lo, num_terms), dtype=np.float32)
+        start, end = row_ptr[lo], row_ptr[hi]
+        dense[rows[start:end] - lo, cols[start:end]] = weights[start:end]
+
+        # Gather the left row's weight at every term of each right row.
+        size = row_len[right[first:last]]
+        pair = np.repeat(np.arange(last - first), size)
+        entry = np.arange(len(pair)) + np.repeat(
+            row_ptr[right[first:last]] - (np.cumsum(size) - size), size
+        )
+        flat = np.repeat((left[first:last] - lo) * num_terms, size) + cols[entry]
+        products = dense.ravel().take(flat) * weights[entry]
+        exact[first:last] = np.bincount(pair, weights=products, minlength=last - first)
+    return exact
+
+
+def _candidate_pairs(signatures: np.ndarray, num_bands: int) -> np.ndarray:
+    """All row pairs (i < j) that share at least one LSH band."""
+    n, num_perm = signatures.shape
+    rows = num_perm // num_bands
+    empty = (signatures == _MAX_HASH).all(axis=1)
+
+    pairs: set[tuple[int, int]] = set()
+    for band in range(num_bands):
+        buckets: dict[bytes, list[int]] = {}
+        block = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(n):
+            if not empty[i]:
+                buckets.setdefault(block[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            pairs.update(combinations(members, 2))
+    return np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
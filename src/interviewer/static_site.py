@@ -0,0 +1,317 @@
+"""Static, pre-rendered export of the transcript viewer.
+
+The site needs no Python at serving time:
+
+- ``index.html``: viewer shell with split filter and Prev/Next/jump navigation
+- ``style.css``: the dashboard's stylesheet
+- ``manifest.json``: corpus version, transcript ids per split and the hash
+  each bundle was rendered from
+- ``transcripts/<id>.json``: one bundle per transcript with the pre-rendered
+  bubble HTML
+
+Comments are not baked in; the page fetches them from ``comments_url``.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from interviewer import render
+from interviewer.corpus import CORPUS_DIR, current_version, open_store, read_manifest
+from interviewer.data import SPLITS
+from interviewer.github import BRANCH, COMMENTS_PATH, REPO_NAME, REPO_OWNER
+
+
+# Bump when the bundle layout changes so existing sites are fully rewritten.
+BUNDLE_FORMAT = 2
+
+DEFAULT_COMMENTS_URL = (
+    f"https://raw.githubusercontent.com/{REPO_OWNER}/{REPO_NAME}/{BRANCH}/{COMMENTS_PATH}"
+)
+
+
+@dataclass
+class StaticBuildResult:
+    version: str
+    written: int = 0
+    skipped: int = 0
+    removed: int = 0
+
+
+def render_fingerprint() -> str:
+    """Hash of the markup, styles and bundle format; a change re-renders all bundles."""
+    source = Path(render.__file__).read_bytes() + render.app_css().encode("utf-8")
+    source += str(BUNDLE_FORMAT).encode("utf-8")
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_static_site(
+    output_dir: str | Path,
+    version: str | None = None,
+    root: Path = CORPUS_DIR,
+    comments_url: str | None = DEFAULT_COMMENTS_URL,
+) -> StaticBuildResult:
+    """Render every transcript of a corpus version into a static site.
+
+    Rebuilding into an existing site compares the version's manifest with the
+    site's, loads and rewrites only bundles whose transcript content hash (or
+    the renderer) changed, and deletes bundles of transcripts that no longer
+    exist.
+
+    Args:
+        output_dir: Directory to write the site into.
+        version: Corpus version to render. Defaults to the current one.
+        root: Corpus cache directory.
+        comments_url: URL of the comments JSONL fetched by the page, or None.
+    """
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(
+            f"No corpus version in {root}; run 'interviewer refresh' first"
+        )
+
+    output_dir = Path(output_dir)
+    bundle_dir = output_dir / "transcripts"
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+
+    old_manifest_path = output_dir / "manifest.json"
+    old = {}
+    if old_manifest_path.exists():
+        old = json.loads(old_manifest_path.read_text())
+    fingerprint = render_fingerprint()
+    old_hashes = old.get("transcripts", {}) if old.get("render") == fingerprint else {}
+
+    result = StaticBuildResult(version=version)
+    splits: dict[str, list[str]] = {s: [] for s in SPLITS}
+    transcripts = {}
+    stale = []
+    for entry in read_manifest(version, root)["transcripts"]:
+        tid, split = entry["transcript_id"], entry["split"]
+        splits[split].append(tid)
+        transcripts[tid] = {"split": split, "hash": entry["hash"]}
+        path = bundle_dir / f"{tid}.json"
+        if old_hashes.get(tid, {}).get("hash") == entry["hash"] and path.exists():
+            result.skipped += 1
+        else:
+            stale.append(tid)
+
+    # Only transcripts whose bundle is stale are decompressed and rendered.
+    store = open_store(version, root) if stale else None
+    for tid in stale:
+        interview = store.get(tid)
+        bundle = {
+            "id": tid,
+            "split": interview["split"],
+            "html": render.transcript_html(interview["messages"]),
+        }
+        _write_atomic(bundle_dir / f"{tid}.json", json.dumps(bundle))
+        result.written += 1
+
+    for tid in set(old.get("transcripts", {})) - set(transcripts):
+        (bundle_dir / f"{tid}.json").unlink(missing_ok=True)
+        result.removed += 1
+
+    _write_atomic(output_dir / "style.css", render.app_css())
+    _write_atomic(output_dir / "index.html", INDEX_HTML)
+    manifest = {
+        "version": version,
+        "render": fingerprint,
+        "comments_url": comments_url,
+        "split_order": SPLITS,
+        "splits": splits,
+        "transcripts": transcripts,
+    }
+    # Written last so a site being rebuilt never points at missing bundles.
+    _write_atomic(output_dir / "manifest.json", json.dumps(manifest))
+    return result
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Anthropic Interviews</title>
+<link rel="stylesheet" href="style.css">
+<style>
+    body {
+        background-color: #1a1a1a;
+        color: #e0e0e0;
+        font-family: "Source Sans Pro", sans-serif;
+        margin: 0;
+    }
+
+    .nav {
+        display: flex;
+        gap: 0.5rem;
+        margin: 8px 0;
+    }
+
+    .nav button, .nav input, .split-select {
+        min-height: 44px;
+        font-size: 18px;
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        border: 1px solid #444;
+        border-radius: 8px;
+    }
+
+    .nav button { flex: 1; cursor: pointer; }
+    .nav button:disabled { opacity: 0.4; cursor: default; }
+    .nav input { flex: 2; text-align: center; min-width: 0; }
+    .split-select { display: block; margin: 0 auto 8px auto; font-size: 15px; }
+    .comment-count { display: inline-flex; margin: 4px 0 0 auto; width: fit-content; }
+    hr { border-color: #333; }
+</style>
+</head>
+<body>
+<div class="block-container">
+    <select id="split" class="split-select" aria-label="Filter by group">
+        <option value="all">all</option>
+    </select>
+    <div id="header" class="interview-header"></div>
+    <div class="nav">
+        <button data-step="-1">&larr; Prev</button>
+        <input type="number" min="1" aria-label="Go to">
+        <button data-step="1">Next &rarr;</button>
+    </div>
+    <div id="transcript"></div>
+    <hr>
+    <div class="nav">
+        <button data-step="-1">&larr; Prev</button>
+        <input type="number" min="1" aria-label="Go to">
+        <button data-step="1">Next &rarr;</button>
+    </div>
+</div>
+<script>
+(async function () {
+    const manifest = await (await fetch("manifest.json", {cache: "no-cache"})).json();
+    const splitSelect = document.getElementById("split");
+    const header = document.getElementById("header");
+    const container = document.getElementById("transcript");
+    const inputs = document.querySelectorAll(".nav input");
+    const state = {split: "all", index: 0};
+    let comments = {};
+
+    for (const split of manifest.split_order) {
+        const option = document.createElement("option");
+        option.value = split;
+        option.textContent = split;
+        splitSelect.appendChild(option);
+    }
+
+    function ids() {
+        if (state.split === "all") {
+            return manifest.split_order.flatMap((s) => manifest.splits[s]);
+        }
+        return manifest.splits[state.split];
+    }
+
+    function escapeContent(text) {
+        return text.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;")
+            .replace(/\\n/g, "<br>");
+    }
+
+    function showComments(id) {
+        const bubbles = container.querySelectorAll(".bubble-container");
+        for (const [index, items] of Object.entries(comments[id] || {})) {
+            const bubble = bubbles[Number(index)];
+            if (!bubble) continue;
+            const section = document.createElement("div");
+            section.className = "comments-section";
+            section.hidden = true;
+            section.innerHTML = items.map((c) =>
+                `<div class="comment-bubble">${escapeContent(c.text)}` +
+                `<div class="comment-timestamp">${(c.timestamp || "").slice(0, 10)}` +
+                `</div></div>`
+            ).join("");
+            const count = document.createElement("div");
+            count.className = "comment-count";
+            count.textContent = items.length;
+            count.title = "Show/hide comments";
+            count.onclick = () => { section.hidden = !section.hidden; };
+            bubble.after(count, section);
+        }
+    }
+
+    async function show() {
+        const list = ids();
+        if (list.length === 0) {
+            state.index = 0;
+            header.textContent = "No interviews";
+            container.innerHTML = "";
+            splitSelect.value = state.split;
+            document.querySelectorAll(".nav button").forEach((b) => {
+                b.disabled = true;
+            });
+            inputs.forEach((input) => { input.max = 0; input.value = ""; });
+            return;
+        }
+        state.index = Math.min(Math.max(state.index, 0), list.length - 1);
+        const id = list[state.index];
+        const bundle = await (await fetch(`transcripts/${id}.json`)).json();
+        header.innerHTML = `<strong>${id}</strong> · ${bundle.split} · ` +
+            `${state.index + 1} of ${list.length}`;
+        container.innerHTML = bundle.html;
+        showComments(id);
+        splitSelect.value = state.split;
+        document.querySelectorAll(".nav button").forEach((b) => {
+            const step = Number(b.dataset.step);
+            b.disabled = step < 0 ? state.index === 0 : state.index >= list.length - 1;
+        });
+        inputs.forEach((input) => {
+            input.max = list.length;
+            input.value = state.index + 1;
+        });
+        history.replaceState(null, "", `#${state.split}/${state.index + 1}`);
+    }
+
+    function go(index, scroll) {
+        state.index = index;
+        show().then(() => { if (scroll) window.scrollTo(0, 0); });
+    }
+
+    splitSelect.onchange = () => { state.split = splitSelect.value; go(0, true); };
+    document.querySelectorAll(".nav button").forEach((b) => {
+        const step = Number(b.dataset.step);
+        b.onclick = () => go(state.index + step, step > 0);
+    });
+    inputs.forEach((input) => {
+        input.onchange = () => go(Number(input.value) - 1, true);
+    });
+
+    const [split, position] = location.hash.slice(1).split("/");
+    if (split === "all" || manifest.split_order.includes(split)) {
+        state.split = split;
+        state.index = (Number(position) || 1) - 1;
+    }
+    await show();
+
+    if (manifest.comments_url) {
+        try {
+            const response = await fetch(manifest.comments_url, {cache: "no-cache"});
+            const text = await response.text();
+            for (const line of text.split("\\n")) {
+                if (!line.trim()) continue;
+                const c = JSON.parse(line);
+                const byIndex = (comments[c.transcript_id] ||= {});
+                (byIndex[c.message_index] ||= []).push(c);
+            }
+            await show();
+        } catch (err) {
+            console.warn("Could not load comments", err);
+        }
+    }
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,362 @@
+"""Compressed in-memory transcript store with per-transcript decompression.
+
+Every transcript's text is compressed on its own (zstd with a dictionary
+trained on the corpus; zlib when ``zstandard`` cannot be imported) into
+one contiguous buffer addressed by an offset table. Parsed messages are not
+stored as strings: each message is a (start, end) span into its transcript's
+text plus a role flag, kept in flat numpy arrays. Records are rebuilt on
+access and the most recently used ones are kept in a small LRU.
+
+A store can be saved to a single file and opened with ``mmap``; all processes
+that open the same file then share its pages instead of holding a copy each.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from interviewer.parser import Message
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - installed without dependencies
+    zstandard = None
+
+
+ROLES = ("assistant", "user")
+CACHE_SIZE = 32
+DICT_SIZE = 112 * 1024
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 9
+# Retrain the zstd dictionary once fewer than this share of the transcripts
+# are ones it was trained on (unchanged since).
+RETRAIN_BELOW = 0.8
+
+_MAGIC = b"IVSTORE1"
+_ALIGN = 64
+_ARRAYS = ("offsets", "message_offsets", "spans", "roles", "in_dictionary")
+
+
+def message_spans(text: str, messages: list[Message]) -> list[tuple[int, int]]:
+    """Locate each parsed message's content in the transcript text.
+
+    ``parse_transcript`` returns stripped slices of the text in order, so each
+    content is found by searching forward from the end of the previous one.
+    """
+    spans = []
+    cursor = 0
+    for msg in messages:
+        start = text.index(msg.content, cursor)
+        cursor = start + len(msg.content)
+        spans.append((start, cursor))
+    return spans
+
+
+class TranscriptStore:
+    """Read-only sequence of interview records backed by compressed text.
+
+    Indexing returns the same dicts as ``parse_corpus`` (id, split, text,
+    messages). ``ids`` and ``splits`` are available without decompressing.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        splits: list[str],
+        buffer: bytes,
+        offsets: np.ndarray,
+        message_offsets: np.ndarray,
+        spans: np.ndarray,
+        roles: np.ndarray,
+        codec: str,
+        dictionary: bytes = b"",
+        in_dictionary: np.ndarray | None = None,
+        cache_size: int = CACHE_SIZE,
+        mapping: mmap.mmap | None = None,
+    ):
+        self.ids = ids
+        self.splits = splits
+        self.buffer = buffer
+        self.offsets = offsets
+        self.message_offsets = message_offsets
+        self.spans = spans
+        self.roles = roles
+        self.codec = codec
+        self.dictionary = dictionary
+        if in_dictionary is None:
+            in_dictionary = np.zeros(len(ids), dtype=bool)
+        self.in_dictionary = in_dictionary
+        self.cache_size = cache_size
+        self._positions = {tid: i for i, tid in enumerate(ids)}
+        self._cache: OrderedDict[int, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._mapping = mapping
+        if codec == "zstd":
+            if zstandard is None:
+                raise ImportError("zstd stores require the 'zstandard' package")
+            self._zstd_dict = (
+                zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            )
+
+    @classmethod
+    def build(
+        cls,
+        interviews: Iterable[dict],
+        codec: str | None = None,
+        dict_size: int = DICT_SIZE,
+        cache_size: int = CACHE_SIZE,
+        previous: "TranscriptStore | None" = None,
+        unchanged: Iterable[str] = (),
+    ) -> "TranscriptStore":
+        """Compress parsed interview records into a store.
+
+        Args:
+            interviews: Records with keys id, split, text, messages.
+            codec: 'zstd' or 'zlib'. Defaults to zstd when available (or to
+                   the codec of ``previous``).
+            dict_size: Size of the trained zstd dictionary in bytes (0 for none).
+            cache_size: Number of decompressed transcripts kept in the LRU.
+            previous: Earlier store to reuse the dictionary and compressed
+                      transcripts of; only transcripts in ``unchanged`` are
+                      copied, everything else is compressed again. Its zstd
+                      dictionary is retrained instead when it has none or when
+                      fewer than ``RETRAIN_BELOW`` of the transcripts are ones
+                      it was trained on.
+            unchanged: transcript_ids whose text is identical in ``previous``.
+        """
+        if previous is not None:
+            codec = codec or previous.codec
+            if codec != previous.codec:
+                previous = None
+        codec = codec or ("zstd" if zstandard is not None else "zlib")
+        if codec == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+        unchanged = set(unchanged) if previous is not None else set()
+
+        ids, splits, texts = [], [], []
+        message_offsets = [0]
+        spans, roles = [], []
+        for interview in interviews:
+            ids.append(interview["id"])
+            splits.append(interview["split"])
+            texts.append(interview["text"].encode("utf-8"))
+            messages = interview["messages"]
+            for span, msg in zip(message_spans(interview["text"], messages), messages):
+                spans.append(span)
+                roles.append(ROLES.index(msg.role))
+            message_offsets.append(len(spans))
+
+        reuse = [previous.position(tid) if tid in unchanged else None for tid in ids]
+        dictionary = b""
+        in_dictionary = np.zeros(len(ids), dtype=bool)
+        if codec == "zstd":
+            zstd_dict = None
+            if previous is not None and previous.dictionary:
+                carried = np.array(
+                    [i is not None and bool(previous.in_dictionary[i]) for i in reuse],
+                    dtype=bool,
+                )
+                if len(ids) and carried.mean() >= RETRAIN_BELOW:
+                    dictionary = bytes(previous.dictionary)
+                    zstd_dict = previous._zstd_dict
+                    in_dictionary = carried
+            if zstd_dict is None:
+                # Blobs of ``previous`` were compressed with another dictionary.
+                reuse = [None] * len(ids)
+                if dict_size and len(texts) >= 8:
+                    zstd_dict = zstandard.train_dictionary(dict_size, texts)
+                    dictionary = zstd_dict.as_bytes()
+                    in_dictionary[:] = True
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=zstd_dict)
+            compress = compressor.compress
+        elif codec == "zlib":
+            def compress(data):
+                return zlib.compress(data, ZLIB_LEVEL)
+        else:
+            raise ValueError(f"Unknown codec '{codec}'")
+
+        blobs = []
+        for index, text in zip(reuse, texts):
+            if index is not None:
+                blobs.append(previous.blob(index))
+            else:
+                blobs.append(compress(text))
+
+        offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in blobs])
+        return cls(
+            ids=ids,
+            splits=splits,
+            buffer=b"".join(blobs),
+            offsets=offsets,
+            message_offsets=np.array(message_offsets, dtype=np.int64),
+            spans=np.array(spans, dtype=np.int32).reshape(-1, 2),
+            roles=np.array(roles, dtype=np.uint8),
+            codec=codec,
+            dictionary=dictionary,
+            in_dictionary=in_dictionary,
+            cache_size=cache_size,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        with self._lock:
+            record = self._cache.get(index)
+            if record is not None:
+                self._cache.move_to_end(index)
+                return record
+
+        record = self._decode(index)
+        with self._lock:
+            self._cache[index] = record
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def position(self, transcript_id: str) -> int | None:
+        return self._positions.get(transcript_id)
+
+    def get(self, transcript_id: str) -> dict | None:
+        """Record for a transcript_id, or None if it is not in the store."""
+        index = self._positions.get(transcript_id)
+        return None if index is None else self[index]
+
+    def blob(self, index: int) -> bytes:
+        """Compressed bytes of one transcript."""
+        return bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]])
+
+    def text(self, index: int) -> str:
+        """Decompress the text of one transcript (bypasses the LRU)."""
+        blob = self.buffer[self.offsets[index]:self.offsets[index + 1]]
+        if self.codec == "zlib":
+            return zlib.decompress(blob).decode("utf-8")
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            # Decompressors are not thread-safe; keep one per thread.
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict)
+            self._local.decompressor = decompressor
+        return decompressor.decompress(blob).decode("utf-8")
+
+    def _decode(self, index: int) -> dict:
+        text = self.text(index)
+        first, last = self.message_offsets[index], self.message_offsets[index + 1]
+        spans = self.spans[first:last].tolist()
+        roles = self.roles[first:last].tolist()
+        messages = [
+            Message(role=ROLES[role], content=text[start:end])
+            for (start, end), role in zip(spans, roles)
+        ]
+        return {
+            "id": self.ids[index],
+            "split": self.splits[index],
+            "text": text,
+            "messages": messages,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the store, excluding the LRU."""
+        arrays = sum(getattr(self, name).nbytes for name in _ARRAYS)
+        names = sum(sys.getsizeof(s) for s in self.ids) + sys.getsizeof(self.ids) * 2
+        return len(self.buffer) + len(self.dictionary) + arrays + names
+
+    def save(self, path: str | Path) -> None:
+        """Write the store to one file that ``open`` can memory-map.
+
+        Layout: magic, header length, JSON header (ids, splits, codec and
+        section offsets), then the compressed buffer, dictionary and arrays,
+        each aligned to 64 bytes.
+        """
+        sections: list[tuple[str, bytes]] = [
+            ("buffer", self.buffer),
+            ("dictionary", self.dictionary),
+        ] + [
+            (name, np.ascontiguousarray(getattr(self, name)).tobytes())
+            for name in _ARRAYS
+        ]
+        layout = {}
+        position = 0
+        for name, data in sections:
+            layout[name] = [position, len(data)]
+            position += -(-len(data) // _ALIGN) * _ALIGN
+        header = {
+            "codec": self.codec,
+            "ids": self.ids,
+            "splits": self.splits,
+            "sections": layout,
+            "arrays": {
+                name: [str(getattr(self, name).dtype), list(getattr(self, name).shape)]
+                for name in _ARRAYS
+            },
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        start = -(-(len(_MAGIC) + 8 + len(header_bytes)) // _ALIGN) * _ALIGN
+
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+            for name, data in sections:
+                f.seek(start + layout[name][0])
+                f.write(data)
+            f.truncate(start + position)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: str | Path, cache_size: int = CACHE_SIZE) -> "TranscriptStore":
+        """Memory-map a saved store read-only.
+
+        The compressed buffer and arrays are views of the mapping, so
+        processes opening the same file share its pages; replacing the file
+        (e.g. publishing a new corpus version) does not affect open stores.
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a transcript store")
+        (header_len,) = struct.unpack_from("<Q", mapping, len(_MAGIC))
+        header_end = len(_MAGIC) + 8 + header_len
+        header = json.loads(mapping[len(_MAGIC) + 8:header_end])
+        start = -(-header_end // _ALIGN) * _ALIGN
+        view = memoryview(mapping)
+
+        def section(name: str) -> memoryview:
+            offset, length = header["sections"][name]
+            return view[start + offset:start + offset + length]
+
+        arrays = {}
+        for name in _ARRAYS:
+            if name not in header["arrays"]:
+                continue  # written before the array existed
+            dtype, shape = header["arrays"][name]
+            arrays[name] = np.frombuffer(section(name), dtype=dtype).reshape(shape)
+        return cls(
+            ids=header["ids"],
+            splits=header["splits"],
+            buffer=section("buffer"),
+            dictionary=bytes(section("dictionary")),
+            codec=header["codec"],
+            cache_size=cache_size,
+            mapping=mapping,
+            **arrays,
+        )
@@ -0,0 +1,159 @@
+"""Synthetic transcripts and comment logs for benchmarks and load tests."""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from interviewer.data import SPLITS, get_split_counts
+from interviewer.parser import ASSISTANT_MARKERS, USER_MARKERS
+
+
+# Comments per 1x corpus (the committed comment log is a few dozen lines).
+BASE_COMMENTS = 200
+
+_ID_PREFIXES = {"workforce": "work", "creatives": "creative", "scientists": "science"}
+
+_WORDS = (
+    "ai model work project tool research team data writing code review draft "
+    "idea time help task client student paper analysis design feedback trust "
+    "quality workflow creative process learning problem question answer result "
+    "experiment colleague deadline summary email report image music story"
+).split()
+
+
+def transcript_id(split: str, index: int) -> str:
+    """Transcript id in the dataset's naming scheme, e.g. 'work_0042'."""
+    return f"{_ID_PREFIXES[split]}_{index:04d}"
+
+
+def _sentence(rng: random.Random, min_words: int = 6, max_words: int = 30) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + rng.choice([".", "?", "!"])
+
+
+def synthetic_transcript(rng: random.Random, turns: int | None = None) -> str:
+    """Generate one transcript covering the formats ``parse_transcript`` handles.
+
+    Mixes every assistant marker style, optional preambles before the first
+    marker, multi-line turns, HTML-looking text and empty turns.
+    """
+    turns = turns if turns is not None else rng.randint(8, 40)
+    marker = rng.choice(ASSISTANT_MARKERS)
+    lines = []
+    if rng.random() < 0.3:
+        lines.append("Transcript " + _sentence(rng, 3, 8))
+    for turn in range(turns):
+        is_user = turn % 2 == 1
+        prefix = rng.choice(USER_MARKERS) if is_user else marker
+        if rng.random() < 0.05:
+            lines.append(prefix)
+            continue
+        paragraphs = [
+            " ".join(_sentence(rng) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        if rng.random() < 0.05:
+            paragraphs.append("<b>Tools & tips</b>")
+        lines.append(f"{prefix} " + "\n".join(paragraphs))
+    return "\n\n".join(lines)
+
+
+def split_sizes(scale: float = 1) -> dict[str, int]:
+    """Number of transcripts per split in a corpus ``scale`` times the real size."""
+    return {
+        split: max(1, round(count * scale))
+        for split, count in get_split_counts().items()
+    }
+
+
+def synthetic_row(split: str, index: int, seed: int = 0) -> dict:
+    """Generate one row; each row has its own seed, so any row can be made alone."""
+    rng = random.Random(f"{seed}:{split}:{index}")
+    return {
+        "transcript_id": transcript_id(split, index),
+        "text": synthetic_transcript(rng),
+    }
+
+
+def synthetic_rows(
+    split: str, scale: float = 1, seed: int = 0, sample: int | None = None
+) -> Iterator[dict]:
+    """Stream the rows of one split, generating each transcript on demand.
+
+    Args:
+        split: Split name.
+        scale: Corpus size relative to the real dataset.
+        seed: Random seed.
+        sample: If given, yield only about this many rows of the whole corpus
+                (split proportionally), spread evenly over the split.
+    """
+    count = split_sizes(scale)[split]
+    if sample is None or sample >= sum(split_sizes(scale).values()):
+        indices = range(count)
+    else:
+        share = count / sum(split_sizes(scale).values())
+        k = min(count, max(1, round(sample * share)))
+        indices = (i * count // k for i in range(k))
+    for index in indices:
+        yield synthetic_row(split, index, seed)
+
+
+def synthetic_dataset(
+    scale: float = 1, seed: int = 0, sample: int | None = None
+) -> dict[str, list[dict]]:
+    """Generate a dataset shaped like the real one, ``scale`` times its size.
+
+    Rows are held in memory; use ``synthetic_rows`` to stream large corpora.
+
+    Returns:
+        Mapping of split to rows with 'transcript_id' and 'text'.
+    """
+    return {split: list(synthetic_rows(split, scale, seed, sample)) for split in SPLITS}
+
+
+def write_synthetic_dataset(
+    directory: str | Path, scale: float = 1, seed: int = 0, batch_size: int = 1000
+) -> Path:
+    """Write a synthetic dataset as one '<split>.parquet' file per split.
+
+    Rows are generated and written in batches, so any scale fits in memory.
+    The directory can be loaded with ``load_raw_dataset(data_dir=...)``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    schema = pa.schema([("transcript_id", pa.string()), ("text", pa.string())])
+    for split in SPLITS:
+        rows = synthetic_rows(split, scale, seed)
+        with pq.ParquetWriter(directory / f"{split}.parquet", schema) as writer:
+            while batch := list(islice(rows, batch_size)):
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return directory
+
+
+def synthetic_comments(scale: float = 1, seed: int = 0) -> str:
+    """Generate a comments JSONL log on user turns of a synthetic corpus.
+
+    Only transcript ids are needed, so no transcripts are generated.
+    """
+    rng = random.Random(seed)
+    sizes = split_sizes(scale)
+    splits = list(sizes)
+    weights = [sizes[split] for split in splits]
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    lines = []
+    for i in range(max(1, round(BASE_COMMENTS * scale))):
+        split = rng.choices(splits, weights)[0]
+        comment = {
+            "transcript_id": transcript_id(split, rng.randrange(sizes[split])),
+            "message_index": 2 * rng.randint(0, 15) + 1,
+            "text": _sentence(rng, 2, 20),
+            "timestamp": (start + timedelta(minutes=i)).isoformat(),
+        }
+        lines.append(json.dumps(comment))
+    return "\n".join(lines) + "\n"
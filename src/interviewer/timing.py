@@ -0,0 +1,214 @@
+"""Lightweight timing spans and counters for the dashboard's hot paths.
+
+Spans and counters are only recorded while a trace is active in the current
+context (one trace per dashboard rerun). Without an active trace ``span`` and
+``incr`` are a context-variable lookup and return immediately.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+
+ENV_ENABLE = "INTERVIEWER_TIMING"
+ENV_EXPORT = "INTERVIEWER_TIMING_EXPORT"
+
+logger = logging.getLogger("interviewer.timing")
+
+_current: ContextVar["Trace | None"] = ContextVar("interviewer_trace", default=None)
+_exporters: list[Callable[[dict], None]] = []
+_NULL = nullcontext()
+
+
+class Trace:
+    """Spans and counters collected during one unit of work (e.g. a rerun)."""
+
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = fields
+        self.start = time.perf_counter()
+        self.spans: list[dict] = []
+        self.counters: Counter = Counter()
+        self.record: dict | None = None
+        self._depth = 0
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        record = {"name": name, "depth": self._depth, **fields}
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record["start_ms"] = (start - self.start) * 1000
+            record["duration_ms"] = (time.perf_counter() - start) * 1000
+            self.spans.append(record)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace": self.name,
+            **self.fields,
+            "duration_ms": (time.perf_counter() - self.start) * 1000,
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+            "counters": dict(self.counters),
+        }
+
+
+def enabled_by_env() -> bool:
+    """Whether timing is switched on with the INTERVIEWER_TIMING env var."""
+    return os.environ.get(ENV_ENABLE, "").lower() in ("1", "true", "yes")
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+def start_trace(name: str = "rerun", **fields) -> Trace:
+    """Start collecting spans and counters in the current context."""
+    trace = Trace(name, **fields)
+    _current.set(trace)
+    return trace
+
+
+def clear_trace() -> None:
+    """Drop any trace left active in the current context (e.g. by an aborted run)."""
+    _current.set(None)
+
+
+def finish_trace(trace: Trace, **fields) -> dict:
+    """Stop collecting, log the trace as JSON and pass it to the exporters.
+
+    Keyword arguments are added to the record (e.g. ``aborted=True``).
+    """
+    if _current.get() is trace:
+        _current.set(None)
+    trace.fields.update(fields)
+    record = trace.record = trace.to_dict()
+    logger.info(json.dumps(record))
+    for exporter in _exporters:
+        exporter(record)
+    return record
+
+
+@contextmanager
+def trace(name: str = "rerun", enabled: bool = True, **fields):
+    """Run a block as a trace and finish it on the way out.
+
+    Yields the Trace, or None when not enabled. A block left by an exception
+    (including Streamlit's rerun and stop signals) is recorded with
+    ``aborted=True``; the finished record is on ``trace.record``.
+    """
+    if not enabled:
+        yield None
+        return
+    active = start_trace(name, **fields)
+    aborted = True
+    try:
+        yield active
+        aborted = False
+    finally:
+        finish_trace(active, aborted=aborted)
+
+
+def span(name: str, **fields):
+    """Time a block as a span of the active trace (no-op without one)."""
+    trace = _current.get()
+    if trace is None:
+        return _NULL
+    return trace.span(name, **fields)
+
+
+def incr(counter: str, n: int = 1) -> None:
+    """Increment a counter of the active trace (no-op without one)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.counters[counter] += n
+
+
+def add_exporter(exporter: Callable[[dict], None]) -> None:
+    """Register a callable that receives every finished trace record."""
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+class JsonlExporter:
+    """Append finished traces to a JSONL file, one trace per line."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def __eq__(self, other):
+        return isinstance(other, JsonlExporter) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Log finished traces to stderr (Streamlit only configures its own loggers)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+def configure_from_env() -> None:
+    """Apply the timing env vars.
+
+    INTERVIEWER_TIMING logs finished traces to stderr; INTERVIEWER_TIMING_EXPORT
+    registers a JSONL exporter.
+    """
+    if enabled_by_env():
+        configure_logging()
+    path = os.environ.get(ENV_EXPORT)
+    if path:
+        add_exporter(JsonlExporter(path))
+
+
+def read_traces(path: str | Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(traces: Iterable[dict], percentiles: tuple[int, ...] = (50, 95)) -> dict:
+    """Latency percentiles per span name (and 'total' per trace) in ms.
+
+    Returns:
+        Mapping of name to {'count': n, 'p50': ..., 'p95': ...}, plus summed
+        counters under the 'counters' key.
+    """
+    durations: dict[str, list[float]] = {}
+    counters: Counter = Counter()
+    for trace in traces:
+        durations.setdefault("total", []).append(trace["duration_ms"])
+        for s in trace["spans"]:
+            durations.setdefault(s["name"], []).append(s["duration_ms"])
+        counters.update(trace.get("counters", {}))
+
+    summary = {}
+    for name, values in durations.items():
+        summary[name] = {"count": len(values)}
+        for p in percentiles:
+            summary[name][f"p{p}"] = float(np.percentile(values, p))
+    summary["counters"] = dict(counters)
+    return summary
@@ -0,0 +1,104 @@
+"""Incremental corpus refresh against a local fixture of two dataset versions."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from interviewer.corpus import (
+    current_version,
+    load_version,
+    open_store,
+    read_manifest,
+    read_statistics,
+    refresh_corpus,
+    version_dir,
+)
+from interviewer.data import SPLITS
+from interviewer.similarity import SimilarityIndex
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "corpus"
+
+
+def read_fixture(name: str) -> dict[str, list[dict]]:
+    """Read one fixture version: a <split>.jsonl file per split."""
+    dataset = {}
+    for split in SPLITS:
+        with open(FIXTURES / name / f"{split}.jsonl", encoding="utf-8") as f:
+            dataset[split] = [json.loads(line) for line in f if line.strip()]
+    return dataset
+
+
+@pytest.fixture
+def refreshed(tmp_path):
+    """Corpus root refreshed from v1 and then v2, plus both results."""
+    root = tmp_path / "incremental"
+    first = refresh_corpus(read_fixture("v1"), root=root)
+    second = refresh_corpus(read_fixture("v2"), root=root)
+    return root, first, second
+
+
+def test_refresh_counts(refreshed):
+    root, first, second = refreshed
+    assert len(first.added) == 8 and first.previous is None
+
+    assert second.previous == first.version
+    assert second.added == ["work_0004"]
+    assert sorted(second.changed) == ["creative_0001", "work_0001"]
+    assert second.removed == ["science_0001"]
+    assert second.unchanged == 5
+    assert current_version(root) == second.version
+
+
+def test_refresh_same_data_is_noop(refreshed):
+    root, _, second = refreshed
+    again = refresh_corpus(read_fixture("v2"), root=root)
+    assert again.is_noop
+    assert again.version == second.version
+    assert again.unchanged == 8 and not (again.added or again.changed or again.removed)
+
+
+def test_previous_version_stays_readable(refreshed):
+    root, first, _ = refreshed
+    ids = [record["id"] for record in load_version(first.version, root)]
+    assert "science_0001" in ids and "work_0004" not in ids
+
+
+def test_incremental_matches_full_rebuild(refreshed, tmp_path):
+    root, _, second = refreshed
+    full_root = tmp_path / "full"
+    full = refresh_corpus(read_fixture("v2"), root=full_root)
+    assert full.version == second.version
+    version = full.version
+    incremental_dir = version_dir(version, root)
+    full_dir = version_dir(version, full_root)
+
+    for name in ("messages.parquet", "transcripts.parquet"):
+        incremental_table = pq.read_table(incremental_dir / name)
+        assert incremental_table.equals(pq.read_table(full_dir / name))
+
+    def manifest(r):
+        m = read_manifest(version, r)
+        return m["version"], m["transcripts"]
+
+    assert manifest(root) == manifest(full_root)
+    assert read_statistics(version, root) == read_statistics(version, full_root)
+
+    incremental_index = SimilarityIndex.load(incremental_dir / "similarity.npz")
+    full_index = SimilarityIndex.load(full_dir / "similarity.npz")
+    assert incremental_index.ids == full_index.ids
+    assert incremental_index.hashes == full_index.hashes
+    for name in ("signatures", "term_ptr", "term_ids", "term_counts", "neighbors"):
+        np.testing.assert_array_equal(
+            getattr(incremental_index, name), getattr(full_index, name)
+        )
+    np.testing.assert_allclose(incremental_index.scores, full_index.scores, rtol=1e-6)
+
+    incremental_store = open_store(version, root)
+    full_store = open_store(version, full_root)
+    assert incremental_store.ids == full_store.ids
+    assert list(incremental_store) == list(full_store)
+    assert list(full_store) == load_version(version, full_root)
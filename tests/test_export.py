@@ -0,0 +1,71 @@
+"""Streaming export of the message table: batch ordering and the comments join."""
+
+import json
+
+from interviewer.cli import main
+from interviewer.data import SPLITS
+from interviewer.export import export_messages
+from interviewer.parser import parse_transcript
+from interviewer.synthetic import synthetic_dataset
+
+
+DATASET = synthetic_dataset(0.02)
+
+
+def batches(batch_size: int = 3):
+    for split in SPLITS:
+        rows = DATASET[split]
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            yield split, {
+                "transcript_id": [r["transcript_id"] for r in chunk],
+                "text": [r["text"] for r in chunk],
+            }
+
+
+def read_jsonl(path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_workers_keep_input_order(tmp_path):
+    serial, parallel = tmp_path / "serial.jsonl", tmp_path / "parallel.jsonl"
+    rows = export_messages(serial, batches=batches(), workers=1)
+    assert export_messages(parallel, batches=batches(), workers=3) == rows
+    assert parallel.read_bytes() == serial.read_bytes()
+
+    expected = [
+        (row["transcript_id"], index)
+        for split in SPLITS
+        for row in DATASET[split]
+        for index, _ in enumerate(parse_transcript(row["text"]))
+    ]
+    exported = read_jsonl(serial)
+    assert [(r["transcript_id"], r["message_index"]) for r in exported] == expected
+
+
+def test_comments_join_onto_their_message(tmp_path):
+    first, second = DATASET["workforce"][0], DATASET["scientists"][-1]
+    note = {"text": "good point", "timestamp": "2026-01-01T00:00:00+00:00"}
+    comments = {
+        (first["transcript_id"], 1): [note, {"text": "no timestamp"}],
+        (second["transcript_id"], 3): [note],
+        ("missing_0000", 1): [note],
+    }
+    path = tmp_path / "out.jsonl"
+    export_messages(path, batches=batches(), comments=comments, workers=2)
+
+    joined = {
+        (r["transcript_id"], r["message_index"]): r["comments"]
+        for r in read_jsonl(path)
+        if r["comments"]
+    }
+    assert joined == {
+        (first["transcript_id"], 1): [note, {"text": "no timestamp", "timestamp": ""}],
+        (second["transcript_id"], 3): [note],
+    }
+
+
+def test_cli_rejects_unknown_suffix(tmp_path, capsys):
+    assert main(["export", str(tmp_path / "out.txt")]) == 1
+    assert "Cannot infer export format" in capsys.readouterr().err
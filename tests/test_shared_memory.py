@@ -0,0 +1,31 @@
+"""Memory per worker process with the memory-mapped corpus store."""
+
+from pathlib import Path
+
+import pytest
+
+from interviewer.benchmark import shared_memory_check
+from interviewer.corpus import refresh_corpus
+from interviewer.synthetic import synthetic_dataset
+
+
+pytestmark = pytest.mark.skipif(
+    not Path("/proc/self/smaps_rollup").exists(),
+    reason="needs Linux /proc/<pid>/smaps_rollup",
+)
+
+MB = 2**20
+
+
+def test_memory_per_added_worker_stays_flat(tmp_path):
+    version = refresh_corpus(synthetic_dataset(0.2), root=tmp_path).version
+    report = shared_memory_check(version, tmp_path, workers=(1, 4), timeout=120)
+    mmap, objects = report["mmap"], report["objects"]
+
+    # Each worker holding its own objects adds a whole corpus; workers mapping
+    # the store share its pages, so adding one costs a small fraction of that.
+    assert objects["pss_per_added_worker"] > 10 * MB
+    assert mmap["pss_per_added_worker"] < 0.1 * objects["pss_per_added_worker"]
+
+    # A worker's private memory does not grow as more workers attach.
+    assert mmap["workers"][4]["private"] <= mmap["workers"][1]["private"] + 1 * MB
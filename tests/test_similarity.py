@@ -0,0 +1,59 @@
+"""Similar-interview scores against a brute-force TF-IDF cosine."""
+
+import numpy as np
+
+from interviewer.similarity import MAX_DF, MIN_DF, _tfidf_neighbors
+
+
+def topic_corpus(n: int, seed: int = 0):
+    """Term counts of n documents, each mixing common words with a topic's words."""
+    rng = np.random.default_rng(seed)
+    vocab = 5000
+    common = 1 / np.arange(1, vocab + 1) ** 1.1
+    common /= common.sum()
+    topics = rng.integers(0, vocab, size=(20, 100))
+    terms, counts = [], []
+    for _ in range(n):
+        words = np.concatenate([
+            rng.choice(vocab, size=300, p=common),
+            rng.choice(topics[rng.integers(len(topics))], size=60),
+        ])
+        ids, n_words = np.unique(words.astype(np.uint32), return_counts=True)
+        terms.append(ids)
+        counts.append(n_words.astype(np.uint32))
+    term_ptr = np.zeros(n + 1, dtype=np.int64)
+    term_ptr[1:] = np.cumsum([len(t) for t in terms])
+    return term_ptr, np.concatenate(terms), np.concatenate(counts)
+
+
+def brute_force(term_ptr, term_ids, counts) -> np.ndarray:
+    n = len(term_ptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(term_ptr))
+    vocab, cols = np.unique(term_ids, return_inverse=True)
+    tf = np.zeros((n, len(vocab)))
+    tf[rows, cols] = counts
+    df = (tf > 0).sum(axis=0)
+    keep = (df >= MIN_DF) & (df <= max(MAX_DF * n, MIN_DF))
+    tf, df = tf[:, keep], df[keep]
+    weights = np.where(tf > 0, 1 + np.log(np.maximum(tf, 1)), 0)
+    weights *= np.log((1 + n) / (1 + df)) + 1
+    weights /= np.linalg.norm(weights, axis=1, keepdims=True)
+    sims = weights @ weights.T
+    np.fill_diagonal(sims, 0)
+    return sims
+
+
+def test_neighbors_match_brute_force():
+    corpus = topic_corpus(400)
+    sims = brute_force(*corpus)
+    neighbors, scores = _tfidf_neighbors(*corpus, top_k=5)
+
+    assert (neighbors >= 0).all()
+    assert (np.diff(scores, axis=1) <= 0).all()
+    # Candidates are scored exactly...
+    found = np.take_along_axis(sims, neighbors, axis=1)
+    np.testing.assert_allclose(scores, found, atol=1e-5)
+    # ...and are as close as the true top 5, up to near-ties.
+    best = -np.sort(-sims, axis=1)[:, :5]
+    assert scores.sum() >= 0.99 * best.sum()
+    assert (neighbors[:, 0] == sims.argmax(axis=1)).mean() > 0.95
@@ -0,0 +1,53 @@
+"""Incremental static-site rebuilds across the two fixture versions."""
+
+import json
+
+from test_corpus import read_fixture
+
+from interviewer.corpus import refresh_corpus
+from interviewer.static_site import build_static_site
+from interviewer.store import TranscriptStore
+
+
+def bundles(site) -> dict[str, dict]:
+    return {
+        path.stem: json.loads(path.read_text())
+        for path in (site / "transcripts").glob("*.json")
+    }
+
+
+def test_rebuild_renders_only_changed_transcripts(tmp_path, monkeypatch):
+    root, site = tmp_path / "corpus", tmp_path / "site"
+    first = refresh_corpus(read_fixture("v1"), root=root)
+    built = build_static_site(site, first.version, root=root)
+    assert (built.written, built.skipped, built.removed) == (8, 0, 0)
+
+    second = refresh_corpus(read_fixture("v2"), root=root)
+    loaded = []
+    get = TranscriptStore.get
+    monkeypatch.setattr(
+        TranscriptStore, "get", lambda self, tid: loaded.append(tid) or get(self, tid)
+    )
+    rebuilt = build_static_site(site, second.version, root=root)
+
+    assert sorted(loaded) == sorted(second.added + second.changed)
+    assert rebuilt.written == 3 and rebuilt.skipped == second.unchanged
+    assert rebuilt.removed == 1
+    assert not (site / "transcripts" / "science_0001.json").exists()
+
+    manifest = json.loads((site / "manifest.json").read_text())
+    assert manifest["version"] == second.version
+    assert "science_0001" not in manifest["transcripts"]
+
+    monkeypatch.undo()
+    full = build_static_site(tmp_path / "full", second.version, root=root)
+    assert full.written == 8
+    assert bundles(site) == bundles(tmp_path / "full")
+
+
+def test_rebuild_same_version_writes_nothing(tmp_path):
+    root, site = tmp_path / "corpus", tmp_path / "site"
+    version = refresh_corpus(read_fixture("v2"), root=root).version
+    build_static_site(site, version, root=root)
+    again = build_static_site(site, version, root=root)
+    assert (again.written, again.skipped, again.removed) == (0, 8, 0)
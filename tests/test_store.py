@@ -0,0 +1,65 @@
+"""Dictionary reuse and retraining of the compressed transcript store."""
+
+import pytest
+
+from interviewer import store
+from interviewer.data import compress_corpus, parse_corpus
+from interviewer.store import TranscriptStore
+from interviewer.synthetic import synthetic_dataset
+
+
+pytestmark = pytest.mark.skipif(store.zstandard is None, reason="needs zstandard")
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return parse_corpus(synthetic_dataset(0.02))
+
+
+def edited(record: dict) -> dict:
+    return {**record, "text": record["text"] + " "}
+
+
+def test_trains_dictionary_when_previous_has_none(corpus):
+    small = TranscriptStore.build(corpus[:5])
+    assert small.dictionary == b""
+
+    unchanged = [r["id"] for r in corpus[:5]]
+    grown = TranscriptStore.build(corpus, previous=small, unchanged=unchanged)
+    assert grown.dictionary
+    assert [grown.text(i) for i in range(len(grown))] == [r["text"] for r in corpus]
+
+
+def test_reuses_dictionary_until_corpus_drifts(corpus):
+    first = TranscriptStore.build(corpus)
+    assert first.in_dictionary.all()
+
+    # Few changes: the dictionary and unchanged blobs are kept.
+    changed = [edited(r) if i < 2 else r for i, r in enumerate(corpus)]
+    second = TranscriptStore.build(
+        changed, previous=first, unchanged=[r["id"] for r in corpus[2:]]
+    )
+    assert second.dictionary == first.dictionary
+    assert second.blob(5) == first.blob(5)
+    assert not second.in_dictionary[:2].any()
+
+    # Changes accumulated over versions: retrained on the current corpus.
+    changed = [edited(r) if i < len(corpus) // 2 else r for i, r in enumerate(changed)]
+    third = TranscriptStore.build(
+        changed, previous=second, unchanged=[r["id"] for r in corpus[len(corpus) // 2:]]
+    )
+    assert third.dictionary != first.dictionary
+    assert third.in_dictionary.all()
+    assert list(third) == changed
+
+
+def test_compress_corpus_matches_parse_corpus():
+    dataset = synthetic_dataset(0.02)
+    assert list(compress_corpus(dataset)) == parse_corpus(dataset)
+
+
+def test_open_zstd_store_without_zstandard(corpus, tmp_path, monkeypatch):
+    TranscriptStore.build(corpus).save(tmp_path / "store.bin")
+    monkeypatch.setattr(store, "zstandard", None)
+    with pytest.raises(ImportError, match="zstandard"):
+        TranscriptStore.open(tmp_path / "store.bin")